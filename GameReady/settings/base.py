@@ -105,6 +105,9 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 POSTHOG_API_KEY = os.environ.get('POSTHOG_API_KEY', '')
 POSTHOG_HOST = os.environ.get('POSTHOG_HOST', 'https://app.posthog.com')
 POSTHOG_ENABLED = bool(POSTHOG_API_KEY)  # Only enable if API key is set
+# Server-side events are buffered and flushed in batches by a background thread
+POSTHOG_FLUSH_INTERVAL = float(os.environ.get('POSTHOG_FLUSH_INTERVAL', '2'))  # seconds
+POSTHOG_FLUSH_BATCH_SIZE = 500  # Flush early once this many events are buffered
 
 # Media files (user uploads)
 MEDIA_URL = '/media/'
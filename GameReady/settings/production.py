@@ -107,22 +107,37 @@ DATABASES = {
 }
 
 # Cache configuration for production
-# Use database cache backend for shared cache (required for django-ratelimit)
-# This stores cache entries in the database, which is shared across all instances
-# Note: The cache table must be created with: python manage.py createcachetable django_cache_table
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
-        'LOCATION': 'django_cache_table',
+# django-ratelimit needs a cache shared by every worker. Redis is preferred when
+# REDIS_URL is set: its INCR/EXPIRE are atomic server-side operations, so rate
+# limit checks don't cost a database round-trip and row lock per request.
+REDIS_URL = os.environ.get('REDIS_URL', '').strip()
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+
+    # django-ratelimit only lists the third-party django-redis backend as
+    # supported, so it warns about Django's built-in RedisCache. Its incr() is
+    # an atomic INCR on a server shared by every worker, which is all
+    # ratelimit needs.
+    SILENCED_SYSTEM_CHECKS = ['django_ratelimit.W001']
+else:
+    # Fall back to the database cache, which is also shared across instances
+    # Note: The cache table must be created with: python manage.py createcachetable django_cache_table
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'django_cache_table',
+        }
     }
-}
 
-# Suppress django-ratelimit system check for database cache
-# Database cache IS a shared cache (stored in database), but django-ratelimit's
-# system check doesn't recognize it. This is acceptable for our use case.
-# Database cache works fine for rate limiting in single-instance deployments.
-# For multi-instance deployments, consider using Redis or Memcached.
-SILENCED_SYSTEM_CHECKS = ['django_ratelimit.E003']
+    # Suppress django-ratelimit system check for database cache
+    # Database cache IS a shared cache (stored in database), but django-ratelimit's
+    # system check doesn't recognize it. This is acceptable for our use case.
+    SILENCED_SYSTEM_CHECKS = ['django_ratelimit.E003']
 
 # Security settings for production
 SECURE_SSL_REDIRECT = True
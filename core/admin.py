@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Team, Profile, ReadinessReport, TeamTag, EmailVerification, PlayerPersonalLabel, FeatureRequest, FeatureRequestComment
+from .models import Team, Profile, ReadinessReport, TeamTag, EmailVerification, EmailJob, PlayerPersonalLabel, FeatureRequest, FeatureRequestComment
 
 
 @admin.register(Team)
@@ -73,6 +73,13 @@ class EmailVerificationAdmin(admin.ModelAdmin):
     list_select_related = ['user']
 
 
+@admin.register(EmailJob)
+class EmailJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'kind', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at']
+    list_filter = ['kind', 'status', 'created_at']
+    readonly_fields = ['created_at', 'sent_at']
+
+
 @admin.register(PlayerPersonalLabel)
 class PlayerPersonalLabelAdmin(admin.ModelAdmin):
     list_display = ['athlete', 'date', 'label', 'created_at', 'updated_at']
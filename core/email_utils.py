@@ -4,15 +4,117 @@ Email utility functions for GameReady.
 This module provides centralized email sending functionality with proper error handling,
 logging, and support for multiple email backends (SMTP, SendGrid, etc.).
 """
+import functools
 import logging
-from django.core.mail import send_mail, EmailMessage
-from django.template.loader import render_to_string
+import smtplib
+import threading
+from django.core.mail import send_mail, get_connection, EmailMultiAlternatives
+from django.template.loader import get_template
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
 from django.urls import reverse
+from django.utils import timezone
 from django.core.exceptions import ImproperlyConfigured
+from .models import EmailJob
 
 logger = logging.getLogger(__name__)
 
+# Settings read on every send, cached at import time.
+# Refreshed by _refresh_cached_settings when tests use override_settings.
+_BASE_URL = getattr(settings, 'BASE_URL', 'http://localhost:8000')
+_DEFAULT_FROM_EMAIL = getattr(settings, 'DEFAULT_FROM_EMAIL', None)
+
+
+@receiver(setting_changed)
+def _refresh_cached_settings(setting, **kwargs):
+    """Keep the module-level settings cache in sync with override_settings."""
+    global _BASE_URL, _DEFAULT_FROM_EMAIL
+    if setting == 'BASE_URL':
+        _BASE_URL = getattr(settings, 'BASE_URL', 'http://localhost:8000')
+    elif setting == 'DEFAULT_FROM_EMAIL':
+        _DEFAULT_FROM_EMAIL = getattr(settings, 'DEFAULT_FROM_EMAIL', None)
+    elif setting.startswith('EMAIL_'):
+        # Backend or SMTP credentials changed - don't reuse the old connection
+        close_shared_connection()
+
+
+# A single email backend connection kept open between sends, so bursts of
+# emails (e.g. the queue worker draining verification emails) pay the SMTP
+# connect/STARTTLS/AUTH cost once. SMTP connections aren't thread-safe, so
+# every use goes through _connection_lock.
+_connection = None
+_connection_lock = threading.Lock()
+
+
+def close_shared_connection():
+    """Close the shared email connection; the next send opens a new one."""
+    global _connection
+    with _connection_lock:
+        if _connection is not None:
+            try:
+                _connection.close()
+            except Exception:
+                pass
+            _connection = None
+
+
+def _send_with_shared_connection(message):
+    """
+    Send a message over the shared, persistent email connection.
+    
+    If the server dropped the idle connection, reconnect and retry once.
+    Any other error discards the connection so the next send starts fresh.
+    
+    Returns:
+        int: Number of messages sent (as returned by EmailMessage.send())
+    """
+    global _connection
+    with _connection_lock:
+        for attempt in range(2):
+            if _connection is None:
+                _connection = get_connection(fail_silently=False)
+                _connection.open()
+            message.connection = _connection
+            try:
+                return message.send(fail_silently=False)
+            except smtplib.SMTPServerDisconnected:
+                _connection = None
+                if attempt:
+                    raise
+            except Exception:
+                try:
+                    _connection.close()
+                except Exception:
+                    pass
+                _connection = None
+                raise
+
+
+VERIFICATION_TEMPLATE_NAME = 'core/emails/verification_email.html'
+
+VERIFICATION_PLAIN_TEXT = """
+Hi {name},
+
+Please verify your email address by clicking the link below:
+
+{verification_url}
+
+This link will expire in 24 hours.
+
+If you didn't create an account, please ignore this email.
+
+Best regards,
+GameReady Team
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def _get_verification_template():
+    """Load the verification email template once and reuse the compiled Template."""
+    return get_template(VERIFICATION_TEMPLATE_NAME)
+
 
 def is_email_configured():
     """
@@ -40,19 +142,24 @@ def is_email_configured():
             return False
     
     # Check DEFAULT_FROM_EMAIL
-    if not getattr(settings, 'DEFAULT_FROM_EMAIL', None):
+    if not _DEFAULT_FROM_EMAIL:
         logger.warning("DEFAULT_FROM_EMAIL is not configured")
         return False
     
     return True
 
 
-def send_verification_email(user, verification_token):
+def send_verification_email(user_id, user_email, user_full_name, verification_token):
     """
     Send email verification email to a user.
     
+    Takes plain values rather than a User instance so callers that already have
+    them (the signup signal, the queue worker) don't need to refetch the user.
+    
     Args:
-        user: User instance
+        user_id: ID of the user (used for logging)
+        user_email: Address to send the verification email to
+        user_full_name: User's full name for the greeting (falls back to the email)
         verification_token: EmailVerification token string
         
     Returns:
@@ -61,79 +168,68 @@ def send_verification_email(user, verification_token):
     # Validate email configuration
     if not is_email_configured():
         error_msg = "Email service is not properly configured. Please contact support."
-        logger.error(f"Email not configured - cannot send verification to {user.email}")
+        logger.error(f"Email not configured - cannot send verification to {user_email}")
         return False, error_msg
     
     # Validate user email
-    if not user.email:
+    if not user_email:
         error_msg = "User email is missing"
-        logger.error(f"Cannot send verification email - user {user.username} has no email")
+        logger.error(f"Cannot send verification email - user {user_id} has no email")
         return False, error_msg
     
     try:
         # Build verification URL
-        base_url = getattr(settings, 'BASE_URL', 'http://localhost:8000')
-        verification_url = base_url + reverse('core:verify_email', args=[verification_token])
+        verification_url = _BASE_URL + reverse('core:verify_email', args=[verification_token])
         
         # Render email template
+        recipient_name = user_full_name or user_email
         context = {
-            'user': user,
+            'recipient_name': recipient_name,
             'verification_url': verification_url,
             'site_name': 'GameReady',
         }
         
-        html_message = render_to_string('core/emails/verification_email.html', context)
-        plain_message = f"""
-Hi {user.get_full_name() or user.email},
-
-Please verify your email address by clicking the link below:
-
-{verification_url}
-
-This link will expire in 24 hours.
-
-If you didn't create an account, please ignore this email.
-
-Best regards,
-GameReady Team
-"""
+        html_message = _get_verification_template().render(context)
+        plain_message = VERIFICATION_PLAIN_TEXT.format(
+            name=recipient_name,
+            verification_url=verification_url,
+        )
         
         # Log email details before sending
         logger.info(
-            f"Attempting to send verification email to {user.email} "
-            f"from {settings.DEFAULT_FROM_EMAIL} "
+            f"Attempting to send verification email to {user_email} "
+            f"from {_DEFAULT_FROM_EMAIL} "
             f"with token {verification_token[:20]}..."
         )
         
-        # Use EmailMessage for better control and to capture SMTP response
+        # Use EmailMultiAlternatives for better control and to capture SMTP response
         # Use friendly "From" name to improve deliverability
-        from_email = f"GameReady <{settings.DEFAULT_FROM_EMAIL}>"
+        from_email = f"GameReady <{_DEFAULT_FROM_EMAIL}>"
         
-        email = EmailMessage(
+        email = EmailMultiAlternatives(
             subject='Verify your GameReady account',
-            body=html_message,
+            body=plain_message,
             from_email=from_email,
-            to=[user.email],
+            to=[user_email],
         )
-        email.content_subtype = "html"  # Set content type to HTML
-        email.attach_alternative(plain_message, "text/plain")  # Add plain text alternative
+        email.attach_alternative(html_message, "text/html")  # Add HTML version
         
         # Add proper email headers to reduce spam filtering
         email.extra_headers = {
-            'Reply-To': settings.DEFAULT_FROM_EMAIL,  # Allow replies
+            'Reply-To': _DEFAULT_FROM_EMAIL,  # Allow replies
             'X-Mailer': 'GameReady',  # Identify the application
             'X-Priority': '1',  # Normal priority
             'Precedence': 'bulk',  # Indicate transactional email
         }
         
-        # Send email
-        result = email.send(fail_silently=False)
+        # Send email over the shared connection
+        result = _send_with_shared_connection(email)
         
         # Log the result (result is the number of emails sent, should be 1)
         logger.info(
             f"SMTP send() returned: {result}. "
-            f"Verification email sent to {user.email} "
-            f"from {settings.DEFAULT_FROM_EMAIL}. "
+            f"Verification email sent to {user_email} "
+            f"from {_DEFAULT_FROM_EMAIL}. "
             f"Verification URL: {verification_url}"
         )
         
@@ -142,7 +238,7 @@ GameReady Team
         if result == 0:
             logger.warning(
                 f"SMTP send() returned 0 - email may not have been accepted by server. "
-                f"Check SendGrid Activity Feed for {user.email}"
+                f"Check SendGrid Activity Feed for {user_email}"
             )
             return False, "Email was not accepted by SMTP server. Check SendGrid Activity Feed."
         
@@ -150,7 +246,7 @@ GameReady Team
         
     except Exception as e:
         error_msg = f"Failed to send verification email: {str(e)}"
-        logger.error(f"Error sending verification email to {user.email}: {e}", exc_info=True)
+        logger.error(f"Error sending verification email to {user_email}: {e}", exc_info=True)
         return False, error_msg
 
 
@@ -179,7 +275,7 @@ def send_email_safely(subject, message, recipient_list, html_message=None, from_
         return False, error_msg
     
     try:
-        from_email = from_email or settings.DEFAULT_FROM_EMAIL
+        from_email = from_email or _DEFAULT_FROM_EMAIL
         
         send_mail(
             subject=subject,
@@ -198,3 +294,138 @@ def send_email_safely(subject, message, recipient_list, html_message=None, from_
         logger.error(f"Error sending email to {', '.join(recipient_list)}: {e}", exc_info=True)
         return False, error_msg
 
+
+def enqueue_verification_email(user_id, user_email, user_full_name, verification_token):
+    """
+    Queue a verification email for the background worker.
+    
+    This is a single INSERT, so it is cheap to call from a request handler.
+    The email is sent by the process_email_queue management command.
+    
+    Args:
+        user_id: ID of the user to send the email to
+        user_email: Address to send the verification email to
+        user_full_name: User's full name for the greeting
+        verification_token: EmailVerification token string
+        
+    Returns:
+        EmailJob instance
+    """
+    return EmailJob.objects.create(
+        kind=EmailJob.Kind.VERIFICATION,
+        payload={
+            'user_id': user_id,
+            'email': user_email,
+            'full_name': user_full_name,
+            'token': verification_token,
+        },
+    )
+
+
+def _send_email_job(job):
+    """
+    Send the email described by a queued job.
+    
+    Returns:
+        tuple: (success: bool, error_message: str or None)
+    """
+    payload = job.payload
+    if job.kind == EmailJob.Kind.VERIFICATION:
+        return send_verification_email(
+            payload.get('user_id'),
+            payload['email'],
+            payload.get('full_name', ''),
+            payload.get('token', ''),
+        )
+    return False, f"Unknown email job kind: {job.kind}"
+
+
+def _claim_email_job():
+    """
+    Claim the oldest due job for this worker.
+    
+    The row is locked with SELECT ... FOR UPDATE SKIP LOCKED only long enough
+    to mark it SENDING and push next_attempt_at out by EmailJob.CLAIM_TIMEOUT,
+    so other workers skip it while it is sent and pick it up again if this
+    worker dies mid-send (process_email_queue() fails it instead if that was
+    its last attempt).
+    
+    Returns:
+        EmailJob instance, or None if no job is due
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        job = (
+            EmailJob.objects.select_for_update(skip_locked=True)
+            .filter(
+                status__in=[EmailJob.Status.PENDING, EmailJob.Status.SENDING],
+                next_attempt_at__lte=now,
+                attempts__lt=EmailJob.MAX_ATTEMPTS,
+            )
+            .order_by('next_attempt_at')
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = EmailJob.Status.SENDING
+        job.attempts += 1
+        job.next_attempt_at = now + EmailJob.CLAIM_TIMEOUT
+        job.save(update_fields=['status', 'attempts', 'next_attempt_at'])
+    return job
+
+
+def process_email_queue(batch_size=50):
+    """
+    Send a batch of due queued emails.
+    
+    Each job is claimed and committed on its own (see _claim_email_job) and
+    sent outside any transaction, so several workers can drain the queue
+    concurrently without holding row locks across SMTP calls or sending the
+    same email twice. Failed jobs are retried with exponential backoff until
+    EmailJob.MAX_ATTEMPTS is reached. A job whose worker died during its final
+    attempt is marked FAILED once its claim expires.
+    
+    Args:
+        batch_size: Maximum number of jobs to process
+        
+    Returns:
+        tuple: (sent: int, failed: int)
+    """
+    sent = 0
+    failed = EmailJob.objects.filter(
+        status=EmailJob.Status.SENDING,
+        next_attempt_at__lte=timezone.now(),
+        attempts__gte=EmailJob.MAX_ATTEMPTS,
+    ).update(
+        status=EmailJob.Status.FAILED,
+        last_error='Worker stopped during the final attempt',
+    )
+    if failed:
+        logger.error(f"Marked {failed} abandoned email job(s) as failed")
+    
+    for _ in range(batch_size):
+        job = _claim_email_job()
+        if job is None:
+            break
+        
+        try:
+            success, error_msg = _send_email_job(job)
+        except Exception as e:
+            success, error_msg = False, str(e)
+        
+        if success:
+            job.status = EmailJob.Status.SENT
+            job.sent_at = timezone.now()
+            job.last_error = ''
+            sent += 1
+        else:
+            job.last_error = error_msg or ''
+            if job.attempts >= EmailJob.MAX_ATTEMPTS:
+                job.status = EmailJob.Status.FAILED
+            else:
+                job.status = EmailJob.Status.PENDING
+                job.next_attempt_at = timezone.now() + EmailJob.RETRY_DELAY * 2 ** (job.attempts - 1)
+            failed += 1
+            logger.error(f"Email job {job.id} failed (attempt {job.attempts}): {error_msg}")
+        job.save(update_fields=['status', 'last_error', 'sent_at', 'next_attempt_at'])
+    return sent, failed
@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+from core.email_utils import process_email_queue
+
+
+class Command(BaseCommand):
+    help = 'Send queued emails (e.g. signup verification emails). Run on a schedule, or with --loop as a long-running worker.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Maximum number of emails to send per batch (default: 50)',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and poll the queue instead of exiting after one batch',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Seconds to wait between polls when the queue is empty in --loop mode (default: 5)',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        verbosity = options.get('verbosity', 1)
+
+        while True:
+            sent, failed = process_email_queue(batch_size=batch_size)
+
+            if verbosity >= 1 and (sent or failed or not options['loop']):
+                self.stdout.write(f'Emails sent: {sent}')
+                if failed:
+                    self.stdout.write(self.style.ERROR(f'Emails failed: {failed}'))
+
+            if not options['loop']:
+                break
+            # Drain back-to-back while there is work, otherwise wait for the next poll
+            if sent + failed < batch_size:
+                time.sleep(options['interval'])
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-17 03:29
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_add_email_job'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='emailjob',
+            name='emailjob_status_created_idx',
+        ),
+        migrations.AddField(
+            model_name='emailjob',
+            name='next_attempt_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='The worker skips the job until this time'),
+        ),
+        migrations.AlterField(
+            model_name='emailjob',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('SENDING', 'Sending'), ('SENT', 'Sent'), ('FAILED', 'Failed')], default='PENDING', max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='emailjob',
+            index=models.Index(fields=['status', 'next_attempt_at'], name='emailjob_status_next_idx'),
+        ),
+    ]
@@ -185,6 +185,47 @@ class EmailVerification(models.Model):
         ]
 
 
+class EmailJob(models.Model):
+    """
+    Durable queue of outgoing emails.
+    Request handlers enqueue a job with a single INSERT; the process_email_queue
+    management command sends them outside the request cycle.
+    """
+    class Kind(models.TextChoices):
+        VERIFICATION = 'VERIFICATION', 'Email Verification'
+
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', 'Pending'
+        SENDING = 'SENDING', 'Sending'
+        SENT = 'SENT', 'Sent'
+        FAILED = 'FAILED', 'Failed'
+
+    MAX_ATTEMPTS = 5
+    # A claimed job whose worker died is picked up again after this long
+    CLAIM_TIMEOUT = timedelta(minutes=5)
+    # Delay before the first retry; doubles with every further failed attempt
+    RETRY_DELAY = timedelta(minutes=1)
+
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    payload = models.JSONField(default=dict, help_text="Data needed to build the email (e.g. user_id, token)")
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now, help_text="The worker skips the job until this time")
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.get_kind_display()} email job #{self.pk} ({self.status})"
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            # Index for the worker's "due pending jobs" query
+            models.Index(fields=['status', 'next_attempt_at'], name='emailjob_status_next_idx'),
+        ]
+
+
 class Profile(models.Model):
     """
     Extends the built-in Django User model.
@@ -1,14 +1,34 @@
 """
 PostHog tracking utility for GameReady.
 Handles server-side event tracking.
+
+Events are buffered in memory and shipped to PostHog by a background flush
+thread, so the PostHog client's serialization and network work never runs on
+the request thread and calls are coalesced into batches.
 """
+import atexit
+import logging
+import threading
+from collections import deque
+
 import posthog
 from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+
+from .models import Profile, Team
+
+logger = logging.getLogger(__name__)
 
 # Initialize PostHog if enabled
 if settings.POSTHOG_ENABLED:
     posthog.api_key = settings.POSTHOG_API_KEY
     posthog.host = settings.POSTHOG_HOST
+    # No transport tuning needed: posthog-python uploads from a single consumer
+    # thread through one module-level requests Session, whose default pool
+    # already keeps the connection alive, and it retries failed batches itself
 else:
     # Create a no-op PostHog instance if not enabled
     class NoOpPostHog:
@@ -18,9 +38,141 @@ else:
             pass
         def alias(self, *args, **kwargs):
             pass
+        def flush(self):
+            pass
+        def shutdown(self):
+            pass
     
     posthog = NoOpPostHog()
 
+# Flush buffered events every POSTHOG_FLUSH_INTERVAL seconds, or as soon as
+# the buffer reaches POSTHOG_FLUSH_BATCH_SIZE events
+FLUSH_INTERVAL = getattr(settings, 'POSTHOG_FLUSH_INTERVAL', 2)
+FLUSH_BATCH_SIZE = getattr(settings, 'POSTHOG_FLUSH_BATCH_SIZE', 500)
+
+# Checked on every tracking call, so read once rather than through LazySettings
+_POSTHOG_ENABLED = bool(getattr(settings, 'POSTHOG_ENABLED', False))
+
+_buffer = deque()
+_buffer_lock = threading.Lock()
+_flush_wakeup = threading.Event()
+_flush_thread = None
+
+
+@receiver(setting_changed)
+def _refresh_cached_settings(setting, **kwargs):
+    """Keep the cached POSTHOG_ENABLED flag in sync with override_settings."""
+    global _POSTHOG_ENABLED
+    if setting == 'POSTHOG_ENABLED':
+        _POSTHOG_ENABLED = bool(getattr(settings, 'POSTHOG_ENABLED', False))
+
+
+def flush_events():
+    """
+    Send all buffered events to PostHog.
+    
+    Called by the background flush thread and by the exit handler.
+    """
+    with _buffer_lock:
+        batch = list(_buffer)
+        _buffer.clear()
+    
+    for method, kwargs in batch:
+        try:
+            getattr(posthog, method)(**kwargs)
+        except Exception as e:
+            # Silently fail - don't break the app if tracking fails
+            logger.warning(f"PostHog {method} error: {e}")
+
+
+def _flush_on_exit():
+    """
+    Drain the buffer and block until the PostHog client has sent it.
+    
+    Registered after posthog's own exit handler, so it runs first (atexit is
+    LIFO) while the client's consumer thread is still alive.
+    """
+    flush_events()
+    try:
+        posthog.shutdown()
+    except Exception as e:
+        logger.warning(f"PostHog shutdown error: {e}")
+
+
+def _flush_loop():
+    """Background loop that drains the buffer on an interval or when full."""
+    while True:
+        _flush_wakeup.wait(FLUSH_INTERVAL)
+        _flush_wakeup.clear()
+        flush_events()
+
+
+def _ensure_flush_thread():
+    """Start the flush thread on first use (not at import, e.g. during migrate)."""
+    global _flush_thread
+    if _flush_thread is not None:
+        return
+    with _buffer_lock:
+        if _flush_thread is None:
+            _flush_thread = threading.Thread(
+                target=_flush_loop, name='posthog-flush', daemon=True
+            )
+            _flush_thread.start()
+            # Flushing the empty queue creates posthog's default client, which
+            # registers its own exit handler before ours
+            posthog.flush()
+            atexit.register(_flush_on_exit)
+
+
+def _enqueue(method, kwargs):
+    """Add a PostHog call to the buffer and wake the flusher if the batch is full."""
+    _ensure_flush_thread()
+    with _buffer_lock:
+        _buffer.append((method, kwargs))
+        buffered = len(_buffer)
+    if buffered >= FLUSH_BATCH_SIZE:
+        _flush_wakeup.set()
+
+
+def _submit(method, **kwargs):
+    """
+    Buffer a PostHog call for the background flush thread.
+    
+    Uses transaction.on_commit() so events are not sent for rolled-back requests.
+    Outside of a transaction, on_commit() runs the callback immediately.
+    """
+    transaction.on_commit(lambda: _enqueue(method, kwargs))
+
+
+def _get_identity(user):
+    """
+    Return (role, team_name) for a user's profile.
+    
+    Uses the profile (and its team) already loaded on the user, e.g. by
+    select_related('profile__team'). Otherwise the profile is fetched with
+    its team in one query and cached through user.profile, so identify_user()
+    and track_event() in the same request share one lookup, and
+    refresh_from_db() drops it like any other cached relation.
+    Both values are None if the user has no profile.
+    """
+    if User.profile.is_cached(user):
+        profile = getattr(user, 'profile', None)
+    else:
+        profile = Profile.objects.select_related('team').filter(user_id=user.pk).first()
+        if profile is not None:
+            user.profile = profile
+    
+    if profile is None:
+        return None, None
+    if profile.team_id is None:
+        return profile.role, None
+    if Profile.team.is_cached(profile):
+        return profile.role, profile.team.name
+    return (
+        profile.role,
+        Team.objects.filter(pk=profile.team_id).values_list('name', flat=True).first(),
+    )
+
 
 def track_event(user, event_name, properties=None):
     """
@@ -31,32 +183,33 @@ def track_event(user, event_name, properties=None):
         event_name: Name of the event (e.g., 'report_submitted')
         properties: Dictionary of event properties
     """
-    if not settings.POSTHOG_ENABLED:
+    if not _POSTHOG_ENABLED:
         return
     
     try:
-        user_id = str(user.id) if user and user.is_authenticated else None
+        # Extract primitives on the request thread - the ORM user is not
+        # passed across threads
+        is_authenticated = user is not None and user.is_authenticated
+        distinct_id = str(user.id) if is_authenticated else 'anonymous'
         props = properties or {}
         
-        # Add user info if authenticated
-        if user and user.is_authenticated:
+        # Add user info if authenticated (a missing profile yields no role
+        # rather than raising, so no exception handling is needed here)
+        if is_authenticated:
             props['user_email'] = user.email
             props['username'] = user.username
-            try:
-                if hasattr(user, 'profile'):
-                    props['user_role'] = user.profile.role
-            except:
-                pass
+            role, _ = _get_identity(user)
+            if role:
+                props['user_role'] = role
         
-        posthog.capture(
-            distinct_id=user_id or 'anonymous',
+        _submit(
+            'capture',
+            distinct_id=distinct_id,
             event=event_name,
             properties=props
         )
     except Exception as e:
         # Silently fail - don't break the app if tracking fails
-        import logging
-        logger = logging.getLogger(__name__)
         logger.warning(f"PostHog tracking error: {e}")
 
 
@@ -68,7 +221,7 @@ def identify_user(user):
     Args:
         user: Django User instance
     """
-    if not settings.POSTHOG_ENABLED or not user or not user.is_authenticated:
+    if not _POSTHOG_ENABLED or user is None or not user.is_authenticated:
         return
     
     try:
@@ -78,21 +231,17 @@ def identify_user(user):
         }
         
         # Add profile info if available
-        try:
-            if hasattr(user, 'profile'):
-                properties['role'] = user.profile.role
-                if user.profile.team:
-                    properties['team_name'] = user.profile.team.name
-        except:
-            pass
+        role, team_name = _get_identity(user)
+        if role:
+            properties['role'] = role
+        if team_name:
+            properties['team_name'] = team_name
         
-        posthog.identify(
+        _submit(
+            'identify',
             distinct_id=str(user.id),
             properties=properties
         )
     except Exception as e:
         # Silently fail - don't break the app if tracking fails
-        import logging
-        logger = logging.getLogger(__name__)
         logger.warning(f"PostHog identify error: {e}")
-
@@ -24,6 +24,9 @@ ALLOWED_ATTRIBUTES = {}
 # Allowed protocols for links (empty list means no links allowed)
 ALLOWED_PROTOCOLS = []
 
+# Runs of whitespace collapsed to a single space
+_WHITESPACE_RE = re.compile(r'\s+')
+
 
 def sanitize_text_field(text, max_length=None, strip_html=True):
     """
@@ -71,7 +74,7 @@ def sanitize_text_field(text, max_length=None, strip_html=True):
     text = text.replace('\r', '')
     
     # Normalize whitespace (replace multiple spaces/tabs/newlines with single space)
-    text = re.sub(r'\s+', ' ', text)
+    text = _WHITESPACE_RE.sub(' ', text)
     
     # Truncate if max_length specified
     if max_length and len(text) > max_length:
@@ -81,6 +84,26 @@ def sanitize_text_field(text, max_length=None, strip_html=True):
     return text.strip()
 
 
+def sanitize_enum(text, choices):
+    """
+    Validate a structured value (role, status code, etc.) against its allowed values.
+    
+    Enum-like input never needs HTML sanitization - it is either one of the known
+    values or rejected - so this skips bleach entirely. Use it instead of
+    sanitize_text_field() for such values.
+    
+    Args:
+        text: Input value
+        choices: Set (or other container) of allowed strings, e.g. frozenset(Profile.Role.values)
+        
+    Returns:
+        The value if it is allowed, otherwise ''
+    """
+    if isinstance(text, str) and text in choices:
+        return text
+    return ''
+
+
 def sanitize_html_field(html_content, allowed_tags=None, allowed_attributes=None):
     """
     Sanitize HTML content while allowing safe HTML tags.
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from django import template
 
 register = template.Library()
@@ -5,22 +7,35 @@ register = template.Library()
 @register.filter
 def get_item(dictionary, key):
     """Get an item from a dictionary using a key."""
-    return dictionary.get(key)
+    if dictionary is None:
+        return None
+    try:
+        return dictionary[key]
+    except (KeyError, TypeError):
+        return None
 
 @register.filter
 def field_name(form, field_suffix):
     """Generate a field name for a form field."""
     return f"id_{field_suffix}"
 
+@lru_cache(maxsize=128)
+def _split_replace_arg(arg):
+    """Split a "old,new" filter argument (cached - templates reuse the same literals)."""
+    parts = arg.split(',')
+    if len(parts) != 2:
+        return None
+    return tuple(parts)
+
 @register.filter
 def replace(value, arg):
     """Replace occurrences of a substring in a string."""
-    if not value or not arg:
+    if not value or not arg or not isinstance(value, str):
         return value
     
     # Split the argument by comma to get old and new values
-    parts = arg.split(',')
-    if len(parts) != 2:
+    parts = _split_replace_arg(arg)
+    if parts is None:
         return value
     
     old, new = parts
@@ -11,17 +11,23 @@ from core.tests.test_utils import (
     create_test_coach,
     create_test_athlete,
     create_test_report,
+    isolate_cache_keys,
 )
 
 
 class LoginTests(TestCase):
     """Tests for user login."""
     
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data once for the class."""
+        cls.login_url = reverse('login')
+        cls.athlete = create_test_athlete()
+        cls.coach = create_test_coach()
+    
     def setUp(self):
-        """Set up test data."""
-        self.login_url = reverse('login')
-        self.athlete = create_test_athlete()
-        self.coach = create_test_coach()
+        """Isolate the login rate limit counters."""
+        isolate_cache_keys(self)
     
     def test_login_page_loads(self):
         """Test that login page loads."""
@@ -111,10 +117,11 @@ class LoginTests(TestCase):
 class LogoutTests(TestCase):
     """Tests for user logout."""
     
-    def setUp(self):
-        """Set up test data."""
-        self.athlete = create_test_athlete()
-        self.logout_url = reverse('logout')
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data once for the class."""
+        cls.athlete = create_test_athlete()
+        cls.logout_url = reverse('logout')
     
     def test_logout_works(self):
         """Test that logout works."""
@@ -133,12 +140,13 @@ class LogoutTests(TestCase):
 class HomeRedirectTests(TestCase):
     """Tests for home page redirects based on role."""
     
-    def setUp(self):
-        """Set up test data."""
-        self.home_url = reverse('core:home')
-        self.athlete = create_test_athlete()
-        self.coach = create_test_coach()
-        create_test_report(self.athlete, report_date=timezone.now().date())
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data once for the class."""
+        cls.home_url = reverse('core:home')
+        cls.athlete = create_test_athlete()
+        cls.coach = create_test_coach()
+        create_test_report(cls.athlete, report_date=timezone.now().date())
     
     def test_home_redirects_unauthenticated_to_login(self):
         """Test that unauthenticated users are redirected to login."""
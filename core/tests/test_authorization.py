@@ -1,6 +1,7 @@
 """
 Tests for authorization and role-based access control.
 """
+from django.contrib.auth.models import User
 from django.test import TestCase
 from django.urls import reverse
 from django.utils import timezone
@@ -10,71 +11,76 @@ from core.tests.test_utils import (
     create_test_coach,
     create_test_team,
     create_test_report,
+    create_test_user,
 )
 
 
 class AuthorizationTests(TestCase):
     """Tests for role-based authorization."""
     
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data."""
-        self.athlete = create_test_athlete()
-        self.coach = create_test_coach()
-        self.team = create_test_team(coach=self.coach)
+        cls.athlete = create_test_athlete()
+        cls.coach = create_test_coach()
+        cls.team = create_test_team(coach=cls.coach)
         # Add athlete to team
-        self.athlete.profile.teams.add(self.team)
-        create_test_report(self.athlete, report_date=timezone.now().date())
+        Profile.teams.through.objects.create(profile_id=cls.athlete.profile.id, team_id=cls.team.id)
+        create_test_report(cls.athlete, report_date=timezone.now().date())
+        
+        cls.home_url = reverse('core:home')
+        cls.coach_dashboard_url = reverse('core:coach_dashboard')
+        cls.player_dashboard_url = reverse('core:player_dashboard')
+        cls.athlete_detail_url = reverse('core:athlete_detail', args=[cls.athlete.id])
     
     def test_athlete_cannot_access_coach_dashboard(self):
         """Test that athletes cannot access coach dashboard."""
-        self.client.login(username='athlete@example.com', password='athletepass123')
-        response = self.client.get(reverse('core:coach_dashboard'))
+        self.client.force_login(self.athlete)
+        response = self.client.get(self.coach_dashboard_url)
         self.assertEqual(response.status_code, 302)  # Redirected
-        self.assertRedirects(response, reverse('core:home'), target_status_code=302)
+        self.assertEqual(response['Location'], self.home_url)
     
     def test_coach_cannot_access_player_dashboard(self):
         """Test that coaches cannot access player dashboard."""
-        self.client.login(username='coach@example.com', password='coachpass123')
-        response = self.client.get(reverse('core:player_dashboard'))
+        self.client.force_login(self.coach)
+        response = self.client.get(self.player_dashboard_url)
         self.assertEqual(response.status_code, 302)  # Redirected
-        self.assertRedirects(response, reverse('core:home'), target_status_code=302)
+        self.assertEqual(response['Location'], self.home_url)
     
     def test_coach_can_access_coach_dashboard(self):
         """Test that coaches can access coach dashboard."""
-        self.client.login(username='coach@example.com', password='coachpass123')
-        response = self.client.get(reverse('core:coach_dashboard'))
+        self.client.force_login(self.coach)
+        response = self.client.get(self.coach_dashboard_url)
         self.assertEqual(response.status_code, 200)
     
     def test_athlete_can_access_player_dashboard(self):
         """Test that athletes can access player dashboard."""
-        self.client.login(username='athlete@example.com', password='athletepass123')
-        response = self.client.get(reverse('core:player_dashboard'))
+        self.client.force_login(self.athlete)
+        response = self.client.get(self.player_dashboard_url)
         self.assertEqual(response.status_code, 200)
     
     def test_unauthenticated_cannot_access_dashboards(self):
         """Test that unauthenticated users cannot access dashboards."""
         # Try coach dashboard
-        response = self.client.get(reverse('core:coach_dashboard'))
+        response = self.client.get(self.coach_dashboard_url)
         self.assertEqual(response.status_code, 302)  # Redirected to login
         
         # Try player dashboard
-        response = self.client.get(reverse('core:player_dashboard'))
+        response = self.client.get(self.player_dashboard_url)
         self.assertEqual(response.status_code, 302)  # Redirected to login
     
     def test_coach_can_view_team_athletes(self):
         """Test that coaches can view athletes from their team."""
-        self.client.login(username='coach@example.com', password='coachpass123')
+        self.client.force_login(self.coach)
         
         # Get athlete detail page
-        athlete_detail_url = reverse('core:athlete_detail', args=[self.athlete.id])
-        response = self.client.get(athlete_detail_url)
+        response = self.client.get(self.athlete_detail_url)
         self.assertEqual(response.status_code, 200)
     
     def test_coach_cannot_view_athletes_from_other_teams(self):
         """Test that coaches cannot view athletes from other teams."""
         # Create another team and athlete
         other_team = create_test_team(name='Other Team')
-        from core.tests.test_utils import create_test_user
         other_athlete = create_test_user(
             username='other_athlete',
             email='other@example.com',
@@ -82,7 +88,7 @@ class AuthorizationTests(TestCase):
         )
         other_athlete.profile.teams.add(other_team)
         
-        self.client.login(username='coach@example.com', password='coachpass123')
+        self.client.force_login(self.coach)
         
         # Try to view athlete from other team
         athlete_detail_url = reverse('core:athlete_detail', args=[other_athlete.id])
@@ -91,7 +97,6 @@ class AuthorizationTests(TestCase):
     
     def test_profile_created_on_user_creation(self):
         """Test that profile is automatically created when user is created."""
-        from django.contrib.auth.models import User
         user = User.objects.create_user(
             username='newuser',
             email='newuser@example.com',
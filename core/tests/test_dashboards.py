@@ -5,27 +5,32 @@ from django.test import TestCase
 from django.urls import reverse
 from django.utils import timezone
 from datetime import date, timedelta
-from core.models import ReadinessReport, TeamSchedule, TeamTag
+from core.models import Profile, ReadinessReport, Team, TeamSchedule, TeamTag
 from core.tests.test_utils import (
-    create_test_athlete, create_test_coach, create_test_team, create_test_report
+    create_test_athlete, create_test_coach, create_test_team,
+    create_test_report, create_test_reports_bulk, create_test_users,
 )
 
 
 class CoachDashboardTests(TestCase):
     """Tests for coach dashboard."""
     
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data."""
-        self.coach = create_test_coach()
-        self.team = create_test_team(name='Test Team', coach=self.coach)
-        self.athlete1 = create_test_athlete(username='athlete1', email='athlete1@example.com')
-        self.athlete2 = create_test_athlete(username='athlete2', email='athlete2@example.com')
+        cls.coach = create_test_coach()
+        cls.team = create_test_team(name='Test Team', coach=cls.coach)
+        cls.athlete1, cls.athlete2 = create_test_users(2, username_prefix='athlete')
         
         # Add athletes to team
-        self.athlete1.profile.teams.add(self.team)
-        self.athlete2.profile.teams.add(self.team)
+        Membership = Profile.teams.through
+        Membership.objects.bulk_create([
+            Membership(profile_id=cls.athlete1.profile.id, team_id=cls.team.id),
+            Membership(profile_id=cls.athlete2.profile.id, team_id=cls.team.id),
+        ])
         
-        self.dashboard_url = reverse('core:coach_dashboard')
+        cls.dashboard_url = reverse('core:coach_dashboard')
+        cls.home_url = reverse('core:home')
     
     def test_coach_dashboard_requires_login(self):
         """Test that coach dashboard requires authentication."""
@@ -35,14 +40,14 @@ class CoachDashboardTests(TestCase):
     def test_coach_dashboard_requires_coach_role(self):
         """Test that only coaches can access coach dashboard."""
         athlete = create_test_athlete()
-        self.client.login(username='athlete@example.com', password='athletepass123')
+        self.client.force_login(athlete)
         response = self.client.get(self.dashboard_url)
         self.assertEqual(response.status_code, 302)  # Redirected
-        self.assertRedirects(response, reverse('core:home'), target_status_code=302)
+        self.assertEqual(response['Location'], self.home_url)
     
     def test_coach_dashboard_loads_for_coach(self):
         """Test that coach dashboard loads for coaches."""
-        self.client.login(username='coach@example.com', password='coachpass123')
+        self.client.force_login(self.coach)
         response = self.client.get(self.dashboard_url)
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, 'Test Team')
@@ -53,8 +58,9 @@ class CoachDashboardTests(TestCase):
         today = timezone.now().date()
         create_test_report(self.athlete1, report_date=today)
         
-        self.client.login(username='coach@example.com', password='coachpass123')
-        response = self.client.get(self.dashboard_url)
+        self.client.force_login(self.coach)
+        with self.assertNumQueries(26):
+            response = self.client.get(self.dashboard_url)
         self.assertEqual(response.status_code, 200)
         # Should show athlete names or usernames in squad_data
         self.assertIn('squad_data', response.context)
@@ -67,11 +73,14 @@ class CoachDashboardTests(TestCase):
         today = timezone.now().date()
         
         # Create reports for today
-        create_test_report(self.athlete1, report_date=today)
-        create_test_report(self.athlete2, report_date=today)
+        ReadinessReport.objects.bulk_create([
+            create_test_report(self.athlete1, report_date=today, commit=False),
+            create_test_report(self.athlete2, report_date=today, commit=False),
+        ])
         
-        self.client.login(username='coach@example.com', password='coachpass123')
-        response = self.client.get(self.dashboard_url, {'date': today.strftime('%Y-%m-%d')})
+        self.client.force_login(self.coach)
+        with self.assertNumQueries(26):
+            response = self.client.get(self.dashboard_url, {'date': today.strftime('%Y-%m-%d')})
         self.assertEqual(response.status_code, 200)
         
         # Should show reports in squad_data
@@ -86,11 +95,14 @@ class CoachDashboardTests(TestCase):
         today = timezone.now().date()
         
         # Create reports with known scores
-        create_test_report(self.athlete1, report_date=today, sleep_quality=8, energy_fatigue=8)
-        create_test_report(self.athlete2, report_date=today, sleep_quality=6, energy_fatigue=6)
+        ReadinessReport.objects.bulk_create([
+            create_test_report(self.athlete1, report_date=today, sleep_quality=8, energy_fatigue=8, commit=False),
+            create_test_report(self.athlete2, report_date=today, sleep_quality=6, energy_fatigue=6, commit=False),
+        ])
         
-        self.client.login(username='coach@example.com', password='coachpass123')
-        response = self.client.get(self.dashboard_url, {'date': today.strftime('%Y-%m-%d')})
+        self.client.force_login(self.coach)
+        with self.assertNumQueries(26):
+            response = self.client.get(self.dashboard_url, {'date': today.strftime('%Y-%m-%d')})
         self.assertEqual(response.status_code, 200)
         
         # Should have team average in context
@@ -100,10 +112,27 @@ class CoachDashboardTests(TestCase):
         self.assertGreaterEqual(avg, 0)
         self.assertLessEqual(avg, 100)
     
+    def test_coach_dashboard_query_count_does_not_grow_with_squad(self):
+        """Test that adding an athlete to the squad adds no queries."""
+        today = timezone.now().date()
+        for athlete in (self.athlete1, self.athlete2):
+            create_test_report(athlete, report_date=today)
+        
+        self.client.force_login(self.coach)
+        with self.assertNumQueries(26):
+            self.client.get(self.dashboard_url)
+        
+        athlete3 = create_test_athlete(username='athlete3', email='athlete3@example.com')
+        athlete3.profile.teams.add(self.team)
+        create_test_report(athlete3, report_date=today)
+        with self.assertNumQueries(26):
+            response = self.client.get(self.dashboard_url)
+        self.assertEqual(len(response.context['squad_data']), 3)
+    
     def test_coach_dashboard_handles_no_team(self):
         """Test that coach dashboard handles coach with no team."""
         coach_no_team = create_test_coach(username='coach_no_team', email='coach_no_team@example.com')
-        self.client.login(username='coach_no_team@example.com', password='coachpass123')
+        self.client.force_login(coach_no_team)
         response = self.client.get(self.dashboard_url)
         self.assertEqual(response.status_code, 200)
         # Should show message about no team
@@ -116,7 +145,7 @@ class CoachDashboardTests(TestCase):
         # Create report for yesterday
         create_test_report(self.athlete1, report_date=yesterday)
         
-        self.client.login(username='coach@example.com', password='coachpass123')
+        self.client.force_login(self.coach)
         response = self.client.get(self.dashboard_url, {'date': yesterday.strftime('%Y-%m-%d')})
         self.assertEqual(response.status_code, 200)
         
@@ -129,7 +158,7 @@ class CoachDashboardTests(TestCase):
     
     def test_coach_dashboard_updates_target_readiness(self):
         """Test that coach can update team target readiness."""
-        self.client.login(username='coach@example.com', password='coachpass123')
+        self.client.force_login(self.coach)
         
         response = self.client.post(self.dashboard_url, {
             'target_readiness': '85'
@@ -139,12 +168,12 @@ class CoachDashboardTests(TestCase):
         self.assertEqual(response.status_code, 302)
         
         # Team target should be updated
-        self.team.refresh_from_db()
-        self.assertEqual(self.team.target_readiness, 85)
+        new_target = Team.objects.filter(pk=self.team.pk).values_list('target_readiness', flat=True).first()
+        self.assertEqual(new_target, 85)
     
     def test_coach_dashboard_invalid_target_readiness(self):
         """Test that invalid target readiness values are rejected."""
-        self.client.login(username='coach@example.com', password='coachpass123')
+        self.client.force_login(self.coach)
         
         # Try invalid value (out of range)
         response = self.client.post(self.dashboard_url, {
@@ -155,17 +184,19 @@ class CoachDashboardTests(TestCase):
         self.assertEqual(response.status_code, 302)
         
         # Team target should not be updated
-        self.team.refresh_from_db()
-        self.assertNotEqual(self.team.target_readiness, 150)
+        new_target = Team.objects.filter(pk=self.team.pk).values_list('target_readiness', flat=True).first()
+        self.assertNotEqual(new_target, 150)
 
 
 class PlayerDashboardTests(TestCase):
     """Tests for player dashboard."""
     
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data."""
-        self.athlete = create_test_athlete()
-        self.dashboard_url = reverse('core:player_dashboard')
+        cls.athlete = create_test_athlete()
+        cls.dashboard_url = reverse('core:player_dashboard')
+        cls.home_url = reverse('core:home')
     
     def test_player_dashboard_requires_login(self):
         """Test that player dashboard requires authentication."""
@@ -175,15 +206,15 @@ class PlayerDashboardTests(TestCase):
     def test_player_dashboard_requires_athlete_role(self):
         """Test that only athletes can access player dashboard."""
         coach = create_test_coach()
-        self.client.login(username='coach@example.com', password='coachpass123')
+        self.client.force_login(coach)
         response = self.client.get(self.dashboard_url)
         self.assertEqual(response.status_code, 302)  # Redirected
-        self.assertRedirects(response, reverse('core:home'), target_status_code=302)
+        self.assertEqual(response['Location'], self.home_url)
     
     def test_player_dashboard_loads_for_athlete(self):
         """Test that player dashboard loads for athletes."""
         create_test_report(self.athlete, report_date=timezone.now().date())
-        self.client.login(username='athlete@example.com', password='athletepass123')
+        self.client.force_login(self.athlete)
         response = self.client.get(self.dashboard_url)
         self.assertEqual(response.status_code, 200)
     
@@ -192,7 +223,7 @@ class PlayerDashboardTests(TestCase):
         today = timezone.now().date()
         create_test_report(self.athlete, report_date=today)
         
-        self.client.login(username='athlete@example.com', password='athletepass123')
+        self.client.force_login(self.athlete)
         response = self.client.get(self.dashboard_url)
         self.assertEqual(response.status_code, 200)
         
@@ -205,12 +236,11 @@ class PlayerDashboardTests(TestCase):
         today = timezone.now().date()
         
         # Create reports for this week
-        for i in range(3):
-            report_date = today - timedelta(days=i)
-            create_test_report(self.athlete, report_date=report_date)
+        create_test_reports_bulk(self.athlete, [today - timedelta(days=i) for i in range(3)])
         
-        self.client.login(username='athlete@example.com', password='athletepass123')
-        response = self.client.get(self.dashboard_url)
+        self.client.force_login(self.athlete)
+        with self.assertNumQueries(19):
+            response = self.client.get(self.dashboard_url)
         self.assertEqual(response.status_code, 200)
         
         # Should have weekly data in context
@@ -222,7 +252,7 @@ class PlayerDashboardTests(TestCase):
         week_start = today - timedelta(days=today.weekday())
         
         create_test_report(self.athlete, report_date=today)
-        self.client.login(username='athlete@example.com', password='athletepass123')
+        self.client.force_login(self.athlete)
         response = self.client.get(self.dashboard_url, {
             'week_start': week_start.strftime('%Y-%m-%d')
         })
@@ -233,12 +263,11 @@ class PlayerDashboardTests(TestCase):
         today = timezone.now().date()
         
         # Create reports for consecutive days
-        for i in range(3):
-            report_date = today - timedelta(days=i)
-            create_test_report(self.athlete, report_date=report_date)
+        create_test_reports_bulk(self.athlete, [today - timedelta(days=i) for i in range(3)])
         
-        self.client.login(username='athlete@example.com', password='athletepass123')
-        response = self.client.get(self.dashboard_url)
+        self.client.force_login(self.athlete)
+        with self.assertNumQueries(19):
+            response = self.client.get(self.dashboard_url)
         self.assertEqual(response.status_code, 200)
         
         # Should show streak information
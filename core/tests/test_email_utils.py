@@ -1,19 +1,28 @@
+from datetime import datetime, timezone as dt_timezone
 from unittest import mock
 
-from django.test import TestCase, override_settings
+import time_machine
+from django.core import mail
+from django.core.mail import get_connection
+from django.test import SimpleTestCase, TestCase, override_settings
 from django.contrib.auth import get_user_model
 
 from core.email_utils import (
     is_email_configured,
     send_verification_email,
     send_email_safely,
+    enqueue_verification_email,
+    process_email_queue,
 )
+from core.models import EmailJob
 
 
 User = get_user_model()
 
+FROZEN_NOW = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
 
-class EmailUtilsConfigurationTests(TestCase):
+
+class EmailUtilsConfigurationTests(SimpleTestCase):
     def test_is_email_configured_requires_default_from(self):
         with override_settings(
             EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
@@ -38,8 +47,9 @@ class EmailUtilsConfigurationTests(TestCase):
     BASE_URL='https://example.com',
 )
 class EmailUtilsSendTests(TestCase):
-    def setUp(self):
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username='email-user',
             email='email-user@example.com',
             password='testpass123',
@@ -47,39 +57,53 @@ class EmailUtilsSendTests(TestCase):
             last_name='User',
         )
 
-    @mock.patch('core.email_utils.EmailMessage')
-    @mock.patch('core.email_utils.render_to_string', return_value='<p>verify</p>')
-    def test_send_verification_email_success(self, render_mock, email_cls):
+    def setUp(self):
+        # None of these tests inspect the HTML body, so skip template rendering
+        template_patcher = mock.patch('core.email_utils._get_verification_template')
+        self.template_mock = template_patcher.start()
+        self.template_mock.return_value.render.return_value = '<p>verify</p>'
+        self.addCleanup(template_patcher.stop)
+
+    @mock.patch('core.email_utils.EmailMultiAlternatives')
+    def test_send_verification_email_success(self, email_cls):
         email_instance = email_cls.return_value
         email_instance.send.return_value = 1
 
-        success, error = send_verification_email(self.user, 'token-123')
+        success, error = send_verification_email(
+            self.user.id, self.user.email, self.user.get_full_name(), 'token-123'
+        )
 
         self.assertTrue(success)
         self.assertIsNone(error)
-        render_mock.assert_called_once()
+        self.template_mock.return_value.render.assert_called_once()
         email_instance.send.assert_called_once()
 
-    def test_send_verification_email_requires_email(self):
-        self.user.email = ''
-        self.user.save()
+    @override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+    def test_send_verification_email_reuses_connection(self):
+        with mock.patch('core.email_utils.get_connection', wraps=get_connection) as conn_mock:
+            send_verification_email(
+                self.user.id, self.user.email, self.user.get_full_name(), 'token-123'
+            )
+            success, error = send_verification_email(
+                self.user.id, self.user.email, self.user.get_full_name(), 'token-456'
+            )
 
-        success, error = send_verification_email(self.user, 'token-123')
+        self.assertTrue(success)
+        self.assertIsNone(error)
+        conn_mock.assert_called_once()
+        self.assertEqual(len(mail.outbox), 2)
+        message = mail.outbox[0]
+        self.assertIn('Hi Email User', message.body)
+        self.assertIn('https://example.com', message.body)
+        self.assertEqual(message.alternatives[0][1], 'text/html')
 
-        self.assertFalse(success)
-        self.assertIn('User email is missing', error)
+    def test_send_verification_email_requires_email(self):
+        success, error = send_verification_email(
+            self.user.id, '', self.user.get_full_name(), 'token-123'
+        )
 
-    @override_settings(
-        EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
-        EMAIL_HOST=None,
-        EMAIL_HOST_USER='',
-        EMAIL_HOST_PASSWORD='',
-        DEFAULT_FROM_EMAIL='',
-    )
-    def test_send_verification_email_missing_config(self):
-        success, error = send_verification_email(self.user, 'token-123')
         self.assertFalse(success)
-        self.assertIn('Email service is not properly configured', error)
+        self.assertIn('User email is missing', error)
 
     @mock.patch('core.email_utils.send_mail')
     def test_send_email_safely_success(self, send_mail_mock):
@@ -93,20 +117,110 @@ class EmailUtilsSendTests(TestCase):
         self.assertIsNone(error)
         send_mail_mock.assert_called_once()
 
-    @override_settings(
-        EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
-        EMAIL_HOST=None,
-        EMAIL_HOST_USER='',
-        EMAIL_HOST_PASSWORD='',
-        DEFAULT_FROM_EMAIL='',
-    )
+    def test_send_email_safely_requires_recipients(self):
+        success, error = send_email_safely('Hi', 'Body', [])
+        self.assertFalse(success)
+        self.assertEqual(error, 'No recipients specified')
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+    EMAIL_HOST=None,
+    EMAIL_HOST_USER='',
+    EMAIL_HOST_PASSWORD='',
+    DEFAULT_FROM_EMAIL='',
+)
+class EmailUtilsMissingConfigTests(SimpleTestCase):
+    def test_send_verification_email_missing_config(self):
+        success, error = send_verification_email(
+            1, 'email-user@example.com', 'Email User', 'token-123'
+        )
+        self.assertFalse(success)
+        self.assertIn('Email service is not properly configured', error)
+
     def test_send_email_safely_missing_config(self):
         success, error = send_email_safely('Hi', 'Body', ['user@example.com'])
         self.assertFalse(success)
         self.assertIn('Email service is not properly configured', error)
 
-    def test_send_email_safely_requires_recipients(self):
-        success, error = send_email_safely('Hi', 'Body', [])
-        self.assertFalse(success)
-        self.assertEqual(error, 'No recipients specified')
 
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.console.EmailBackend',
+    DEFAULT_FROM_EMAIL='noreply@example.com',
+    BASE_URL='https://example.com',
+)
+class EmailQueueTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='queue-user',
+            email='queue-user@example.com',
+            password='testpass123',
+        )
+
+    def test_process_email_queue_sends_pending_jobs(self):
+        job = enqueue_verification_email(self.user.id, self.user.email, '', 'token-123')
+
+        with mock.patch('core.email_utils.send_verification_email', return_value=(True, None)) as send_mock:
+            sent, failed = process_email_queue()
+
+        self.assertEqual((sent, failed), (1, 0))
+        send_mock.assert_called_once_with(self.user.id, 'queue-user@example.com', '', 'token-123')
+        job.refresh_from_db()
+        self.assertEqual(job.status, EmailJob.Status.SENT)
+        self.assertIsNotNone(job.sent_at)
+
+    def test_process_email_queue_retries_with_backoff_then_gives_up(self):
+        with time_machine.travel(FROZEN_NOW, tick=False) as traveller:
+            job = enqueue_verification_email(self.user.id, self.user.email, '', 'token-123')
+
+            with mock.patch('core.email_utils.send_verification_email', return_value=(False, 'SMTP down')):
+                for attempt in range(1, EmailJob.MAX_ATTEMPTS + 1):
+                    self.assertEqual(process_email_queue(), (0, 1))
+                    # Not due again until the backoff has passed
+                    self.assertEqual(process_email_queue(), (0, 0))
+                    traveller.shift(EmailJob.RETRY_DELAY * 2 ** (attempt - 1))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, EmailJob.Status.FAILED)
+        self.assertEqual(job.attempts, EmailJob.MAX_ATTEMPTS)
+        self.assertEqual(job.last_error, 'SMTP down')
+
+    def test_process_email_queue_reclaims_stale_claims(self):
+        with time_machine.travel(FROZEN_NOW, tick=False) as traveller:
+            job = enqueue_verification_email(self.user.id, self.user.email, '', 'token-123')
+            # Simulate a worker that claimed the job and died before sending
+            EmailJob.objects.filter(pk=job.pk).update(
+                status=EmailJob.Status.SENDING,
+                attempts=1,
+                next_attempt_at=FROZEN_NOW + EmailJob.CLAIM_TIMEOUT,
+            )
+
+            with mock.patch('core.email_utils.send_verification_email', return_value=(True, None)):
+                self.assertEqual(process_email_queue(), (0, 0))
+                traveller.shift(EmailJob.CLAIM_TIMEOUT)
+                self.assertEqual(process_email_queue(), (1, 0))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, EmailJob.Status.SENT)
+        self.assertEqual(job.attempts, 2)
+
+    def test_process_email_queue_fails_expired_final_claims(self):
+        with time_machine.travel(FROZEN_NOW, tick=False) as traveller:
+            job = enqueue_verification_email(self.user.id, self.user.email, '', 'token-123')
+            # Simulate a worker that died during the job's last allowed attempt
+            EmailJob.objects.filter(pk=job.pk).update(
+                status=EmailJob.Status.SENDING,
+                attempts=EmailJob.MAX_ATTEMPTS,
+                next_attempt_at=FROZEN_NOW + EmailJob.CLAIM_TIMEOUT,
+            )
+
+            with mock.patch('core.email_utils.send_verification_email') as send_mock:
+                self.assertEqual(process_email_queue(), (0, 0))
+                traveller.shift(EmailJob.CLAIM_TIMEOUT)
+                with self.assertLogs('core.email_utils', level='ERROR'):
+                    self.assertEqual(process_email_queue(), (0, 1))
+
+        send_mock.assert_not_called()
+        job.refresh_from_db()
+        self.assertEqual(job.status, EmailJob.Status.FAILED)
+        self.assertEqual(job.attempts, EmailJob.MAX_ATTEMPTS)
@@ -1,14 +1,11 @@
 import os
 import shutil
 import tempfile
-from io import BytesIO
 
 from django.contrib.auth.models import User
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase, override_settings
 
-from PIL import Image
-
 from core.forms import (
     TeamLogoForm,
     TeamScheduleForm,
@@ -20,41 +17,49 @@ from core.forms import (
     AddMemberForm,
 )
 from core.models import TeamSchedule, TeamTag
-from core.tests.test_utils import create_test_team, create_test_athlete, create_test_coach
+from core.tests.test_utils import (
+    build_oversized_png_bytes,
+    build_test_png_bytes,
+    create_test_athlete,
+    create_test_coach,
+    create_test_team,
+)
 
 
 class TeamLogoFormTests(TestCase):
     """Tests for TeamLogoForm validation and saving."""
 
+    @classmethod
+    def setUpClass(cls):
+        cls.media_root = tempfile.mkdtemp()
+        cls.override = override_settings(MEDIA_ROOT=cls.media_root)
+        cls.override.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.override.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+
     def setUp(self):
         self.team = create_test_team()
-        self.media_root = tempfile.mkdtemp()
-        self.override = override_settings(MEDIA_ROOT=self.media_root)
-        self.override.enable()
 
     def tearDown(self):
-        self.override.disable()
-        shutil.rmtree(self.media_root, ignore_errors=True)
+        # Remove uploads saved by the test; the directory itself is reused
+        for entry in os.listdir(self.media_root):
+            path = os.path.join(self.media_root, entry)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                os.remove(path)
 
-    def _make_image_file(self, name='logo.png', size=(100, 100), color='red'):
-        img = Image.new('RGB', size, color=color)
-        buffer = BytesIO()
-        img.save(buffer, format='PNG')
-        buffer.seek(0)
-        return SimpleUploadedFile(name, buffer.read(), content_type='image/png')
+    def _make_image_file(self, name='logo.png', size=(4, 4), color='red'):
+        return SimpleUploadedFile(name, build_test_png_bytes(size, color), content_type='image/png')
 
     def _make_large_image_file(self, name='large_logo.png'):
-        """Generate a noisy PNG file that exceeds the 5MB limit."""
-        side = 1800
-        max_size = 5 * 1024 * 1024
-        while True:
-            img = Image.effect_noise((side, side), 100).convert('RGB')
-            buffer = BytesIO()
-            img.save(buffer, format='PNG')
-            data = buffer.getvalue()
-            if len(data) > max_size:
-                return SimpleUploadedFile(name, data, content_type='image/png')
-            side += 200
+        """Wrap the cached oversized PNG in a fresh upload."""
+        return SimpleUploadedFile(name, build_oversized_png_bytes(), content_type='image/png')
 
     def test_team_logo_form_accepts_valid_image(self):
         """Form saves when provided a valid image and required branding fields."""
@@ -92,7 +97,9 @@ class TeamLogoFormTests(TestCase):
 
     def test_team_logo_form_rejects_invalid_extension(self):
         """Unsupported file extensions should be rejected with clear messaging."""
-        bad_file = self._make_image_file(name='logo.exe')
+        # ImageField verifies the content before the extension check, so this
+        # still has to be a real image; reuse the cached bytes as-is
+        bad_file = SimpleUploadedFile('logo.exe', build_test_png_bytes(), content_type='application/octet-stream')
 
         form = TeamLogoForm(
             data={
@@ -111,22 +118,17 @@ class TeamLogoFormTests(TestCase):
 class TeamScheduleFormTests(TestCase):
     """Tests for TeamScheduleForm weekly schedule handling."""
 
-    def setUp(self):
-        self.team = create_test_team()
-        self.tag_a = TeamTag.objects.create(team=self.team, name='Training', target_min=60, target_max=80)
-        self.tag_b = TeamTag.objects.create(team=self.team, name='Recovery', target_min=40, target_max=60)
-        self.schedule = TeamSchedule.objects.create(team=self.team, weekly_schedule={'Mon': self.tag_a.id})
+    @classmethod
+    def setUpTestData(cls):
+        cls.team = create_test_team()
+        cls.tag_a = TeamTag.objects.create(team=cls.team, name='Training', target_min=60, target_max=80)
+        cls.tag_b = TeamTag.objects.create(team=cls.team, name='Recovery', target_min=40, target_max=60)
+        cls.schedule = TeamSchedule.objects.create(team=cls.team, weekly_schedule={'Mon': cls.tag_a.id})
+
+    _DAYS = ('day_mon', 'day_tue', 'day_wed', 'day_thu', 'day_fri', 'day_sat', 'day_sun')
 
     def _all_day_data(self, value):
-        return {
-            'day_mon': str(value),
-            'day_tue': str(value),
-            'day_wed': str(value),
-            'day_thu': str(value),
-            'day_fri': str(value),
-            'day_sat': str(value),
-            'day_sun': str(value),
-        }
+        return dict.fromkeys(self._DAYS, str(value))
 
     def test_schedule_form_populates_existing_values(self):
         """Existing weekly_schedule values should populate initial field data."""
@@ -158,7 +160,7 @@ class ReminderSettingsFormTests(TestCase):
         self.profile = self.athlete.profile
         self.profile.daily_reminder_enabled = False
         self.profile.timezone = 'UTC'
-        self.profile.save()
+        self.profile.save(update_fields=['daily_reminder_enabled', 'timezone'])
 
     def test_form_initializes_from_profile(self):
         """Initial values should match the profile."""
@@ -191,31 +193,34 @@ class ReminderSettingsFormTests(TestCase):
 class JoinTeamFormTests(TestCase):
     """Tests for joining a team via join code."""
 
-    def setUp(self):
-        self.team = create_test_team(name='Joinable Team')
+    @classmethod
+    def setUpTestData(cls):
+        cls.team = create_test_team(name='Joinable Team')
 
     def test_valid_join_code_returns_team(self):
         form = JoinTeamForm(data={'join_code': self.team.join_code})
         self.assertTrue(form.is_valid())
         self.assertEqual(form.cleaned_data['team'], self.team)
 
-    def test_invalid_format_rejected(self):
-        form = JoinTeamForm(data={'join_code': 'abc'})
-        self.assertFalse(form.is_valid())
-        self.assertIn('Team code must be 6 alphanumeric characters.', form.errors['join_code'])
-
-    def test_unknown_code_rejected(self):
-        form = JoinTeamForm(data={'join_code': 'ZZZZZZ'})
-        self.assertFalse(form.is_valid())
-        self.assertIn('Invalid team code', form.errors['join_code'][0])
+    def test_invalid_codes_rejected(self):
+        cases = [
+            ('abc', 'Team code must be 6 alphanumeric characters.'),
+            ('ZZZZZZ', 'Invalid team code'),
+        ]
+        for code, expected in cases:
+            with self.subTest(code=code):
+                form = JoinTeamForm(data={'join_code': code})
+                self.assertFalse(form.is_valid())
+                self.assertIn(expected, form.errors['join_code'][0])
 
 
 class JoinTeamByCodeFormTests(TestCase):
     """Tests for authenticated users joining teams via code."""
 
-    def setUp(self):
-        self.user = create_test_athlete(username='joiner', email='joiner@example.com')
-        self.team = create_test_team(name='Secondary Team')
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_test_athlete(username='joiner', email='joiner@example.com')
+        cls.team = create_test_team(name='Secondary Team')
 
     def test_form_adds_team_to_profile(self):
         form = JoinTeamByCodeForm(
@@ -228,15 +233,16 @@ class JoinTeamByCodeFormTests(TestCase):
         self.user.profile.refresh_from_db()
         self.assertTrue(self.user.profile.teams.filter(id=self.team.id).exists())
 
-    def test_requires_join_code(self):
-        form = JoinTeamByCodeForm(data={}, user=self.user)
-        self.assertFalse(form.is_valid())
-        self.assertIn('This field is required.', form.errors['join_code'])
-
-    def test_rejects_invalid_code_format(self):
-        form = JoinTeamByCodeForm(data={'join_code': '!!!'}, user=self.user)
-        self.assertFalse(form.is_valid())
-        self.assertIn('Team code must be 6 alphanumeric characters.', form.errors['join_code'][0])
+    def test_rejects_missing_or_malformed_code(self):
+        cases = [
+            ({}, 'This field is required.'),
+            ({'join_code': '!!!'}, 'Team code must be 6 alphanumeric characters.'),
+        ]
+        for data, expected in cases:
+            with self.subTest(data=data):
+                form = JoinTeamByCodeForm(data=data, user=self.user)
+                self.assertFalse(form.is_valid())
+                self.assertIn(expected, form.errors['join_code'][0])
 
     def test_rejects_duplicate_membership(self):
         self.user.profile.teams.add(self.team)
@@ -303,8 +309,9 @@ class FeatureRequestCommentFormTests(TestCase):
 class AddMemberFormTests(TestCase):
     """Tests for adding existing members to a team."""
 
-    def setUp(self):
-        self.existing_user = create_test_athlete(username='existing-user', email='existing@example.com')
+    @classmethod
+    def setUpTestData(cls):
+        cls.existing_user = create_test_athlete(username='existing-user', email='existing@example.com')
 
     def test_requires_username_or_email(self):
         form = AddMemberForm(data={'username': '', 'email': '', 'role': 'ATHLETE'})
@@ -10,7 +10,7 @@ class PlayerStatusTests(TestCase):
         self.user = User.objects.create_user(username='athlete', password='pw')
         # Profile is auto-created via signal
         self.user.profile.role = Profile.Role.ATHLETE
-        self.user.profile.save()
+        self.user.profile.save(update_fields=['role'])
 
     def test_profile_default_status(self):
         p = self.user.profile
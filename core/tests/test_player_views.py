@@ -14,23 +14,31 @@ from core.tests.test_utils import (
 )
 
 
+AVAILABLE_STATUS_PAYLOAD = json.dumps(
+    {'status': Profile.PlayerStatus.AVAILABLE, 'note': 'Ready to play'}
+).encode()
+INVALID_STATUS_PAYLOAD = json.dumps({'status': 'INVALID'}).encode()
+
+
 class PlayerAjaxTests(TestCase):
     """Tests for player-facing AJAX endpoints."""
 
+    @classmethod
+    def setUpTestData(cls):
+        cls.coach = create_test_coach(username='coach-player', email='coach-player@example.com')
+        cls.team = create_test_team(name='Player Team', coach=cls.coach)
+        cls.athlete = create_test_athlete(username='player', email='player@example.com', team=cls.team)
+        cls.athlete.profile.teams.add(cls.team)
+        cls.today = timezone.now().date()
+        cls.report = create_test_report(cls.athlete, report_date=cls.today, sleep_quality=7)
+
     def setUp(self):
-        self.athlete = create_test_athlete(username='player', email='player@example.com')
-        self.coach = create_test_coach(username='coach-player', email='coach-player@example.com')
-        self.team = create_test_team(name='Player Team', coach=self.coach)
-        self.athlete.profile.team = self.team
-        self.athlete.profile.save()
-        self.athlete.profile.teams.add(self.team)
-        self.today = timezone.now().date()
-        self.report = create_test_report(self.athlete, report_date=self.today, sleep_quality=7)
-        self.client.login(username='player@example.com', password='athletepass123')
+        self.client.force_login(self.athlete)
 
     def test_player_metrics_self_ajax_returns_metrics(self):
         url = reverse('core:player_metrics_self_ajax')
-        response = self.client.get(url, {'date': self.today.strftime('%Y-%m-%d')})
+        with self.assertNumQueries(7):
+            response = self.client.get(url, {'date': self.today.strftime('%Y-%m-%d')})
         self.assertEqual(response.status_code, 200)
         payload = response.json()
         self.assertTrue(payload['success'])
@@ -39,10 +47,9 @@ class PlayerAjaxTests(TestCase):
 
     def test_player_set_status_updates_profile(self):
         url = reverse('core:player_set_status')
-        payload = {'status': Profile.PlayerStatus.AVAILABLE, 'note': 'Ready to play'}
         response = self.client.post(
             url,
-            data=json.dumps(payload),
+            data=AVAILABLE_STATUS_PAYLOAD,
             content_type='application/json',
         )
         self.assertEqual(response.status_code, 200)
@@ -56,7 +63,7 @@ class PlayerAjaxTests(TestCase):
         url = reverse('core:player_set_status')
         response = self.client.post(
             url,
-            data=json.dumps({'status': 'INVALID'}),
+            data=INVALID_STATUS_PAYLOAD,
             content_type='application/json',
         )
         self.assertEqual(response.status_code, 400)
@@ -66,79 +73,90 @@ class PlayerAjaxTests(TestCase):
 class PlayerPartialViewTests(TestCase):
     """Tests for player dashboard partials."""
 
-    def setUp(self):
-        self.athlete = create_test_athlete(username='partial-player', email='partial@example.com', with_today_report=True)
-        self.team = create_test_team(name='Partial Team')
-        self.athlete.profile.team = self.team
-        self.athlete.profile.save()
-        self.athlete.profile.teams.add(self.team)
-        self.client.login(username='partial@example.com', password='athletepass123')
-
-        self.tag = TeamTag.objects.create(
-            team=self.team,
+    @classmethod
+    def setUpTestData(cls):
+        cls.team = create_test_team(name='Partial Team')
+        cls.athlete = create_test_athlete(
+            username='partial-player', email='partial@example.com', with_today_report=True, team=cls.team
+        )
+        cls.athlete.profile.teams.add(cls.team)
+
+        cls.tag = TeamTag.objects.create(
+            team=cls.team,
             name='Training',
             target_min=60,
             target_max=80,
             color='#0d6efd',
         )
-        self.schedule = TeamSchedule.objects.create(team=self.team)
-        self.schedule.set_day_tag('Mon', self.tag.id)
+        cls.schedule = TeamSchedule.objects.create(team=cls.team)
+        cls.schedule.set_day_tag('Mon', cls.tag.id)
+        cls.schedule.save(update_fields=['weekly_schedule'])
+        cls.month_str = timezone.now().strftime('%Y-%m')
+
+    def setUp(self):
+        self.client.force_login(self.athlete)
 
     def test_player_week_partial_returns_html(self):
         url = reverse('core:player_week_partial')
         response = self.client.get(url)
-        self.assertEqual(response.status_code, 200)
-        self.assertIn('Weekly Overview', response.content.decode())
+        self.assertContains(response, 'Weekly Overview')
 
     def test_player_month_partial_returns_html(self):
         url = reverse('core:player_month_partial')
-        response = self.client.get(url, {'month': timezone.now().strftime('%Y-%m')})
-        self.assertEqual(response.status_code, 200)
-        self.assertIn('Monthly Overview', response.content.decode())
+        # Constant regardless of how many days (or tagged days) the month has
+        with self.assertNumQueries(12):
+            response = self.client.get(url, {'month': self.month_str})
+        self.assertContains(response, 'Monthly Overview')
 
     def test_player_month_partial_includes_day_tags(self):
         """Regression test: ensure schedule dots remain after month navigation."""
         url = reverse('core:player_month_partial')
-        response = self.client.get(url, {'month': timezone.now().strftime('%Y-%m')})
-        self.assertEqual(response.status_code, 200)
-        html = response.content.decode()
+        with self.assertNumQueries(12):
+            response = self.client.get(url, {'month': self.month_str})
         # color hex should appear for tag indicator
-        self.assertIn('#0d6efd', html)
+        self.assertContains(response, '#0d6efd')
 
 
 class CoachPlayerAjaxTests(TestCase):
     """Tests for coach-facing player AJAX endpoints."""
 
-    def setUp(self):
-        self.coach = create_test_coach(username='coach-day', email='coach-day@example.com')
-        self.team = create_test_team(name='Coach Team', coach=self.coach)
-        self.athlete = create_test_athlete(username='ath-day', email='ath-day@example.com')
-        self.athlete.profile.team = self.team
-        self.athlete.profile.save()
-        self.athlete.profile.teams.add(self.team)
-        self.client.login(username='coach-day@example.com', password='coachpass123')
-
-        self.tag = TeamTag.objects.create(
-            team=self.team,
+    @classmethod
+    def setUpTestData(cls):
+        cls.coach = create_test_coach(username='coach-day', email='coach-day@example.com')
+        cls.team = create_test_team(name='Coach Team', coach=cls.coach)
+        cls.athlete = create_test_athlete(username='ath-day', email='ath-day@example.com', team=cls.team)
+        cls.athlete.profile.teams.add(cls.team)
+
+        cls.tag = TeamTag.objects.create(
+            team=cls.team,
             name='Game Day',
             target_min=80,
             target_max=100,
             color='#198754',
         )
-        self.schedule = TeamSchedule.objects.create(team=self.team)
-        self.schedule.set_day_tag('Mon', self.tag.id)
-        self.date_str = timezone.now().date().strftime('%Y-%m-%d')
+        today = timezone.now().date()
+        # Tag today's weekday so the day-details lookup finds it whatever day the suite runs
+        cls.schedule = TeamSchedule.objects.create(
+            team=cls.team,
+            weekly_schedule={today.strftime('%a'): cls.tag.id},
+        )
+        cls.date_str = today.strftime('%Y-%m-%d')
+
+    def setUp(self):
+        self.client.force_login(self.coach)
 
     def test_coach_player_day_details_requires_date(self):
         url = reverse('core:coach_player_day_details', args=[self.athlete.id])
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
-        self.assertFalse(response.json()['success'])
-        self.assertIn('Date parameter required', response.json()['message'])
+        data = response.json()
+        self.assertFalse(data['success'])
+        self.assertIn('Date parameter required', data['message'])
 
     def test_coach_player_day_details_returns_schedule_tags(self):
         url = reverse('core:coach_player_day_details', args=[self.athlete.id])
-        response = self.client.get(url, {'date': self.date_str})
+        with self.assertNumQueries(17):
+            response = self.client.get(url, {'date': self.date_str})
         self.assertEqual(response.status_code, 200)
         data = response.json()
         self.assertTrue(data['success'])
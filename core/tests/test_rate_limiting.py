@@ -1,93 +1,93 @@
 """
 Tests for rate limiting functionality.
 """
-from django.test import TestCase, override_settings
-from django.urls import reverse
+from datetime import datetime, timezone as dt_timezone
+
+import time_machine
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse_lazy
 from django.core import mail
-from django.core.cache import cache
 from django_ratelimit.exceptions import Ratelimited
 from core.models import Profile, Team
-from core.tests.test_utils import create_test_athlete, create_test_coach, create_test_team
+from core.tests.test_utils import create_test_athlete, create_test_coach, create_test_team, isolate_cache_keys, select_signup_role
+
+
+# Resolved on first use and then reused, instead of reversing in every setUp
+LOGIN_URL = reverse_lazy('login')
+SIGNUP_URL = reverse_lazy('core:signup')
+VERIFY_EMAIL_PENDING_URL = reverse_lazy('core:verify_email_pending')
+PASSWORD_RESET_URL = reverse_lazy('password_reset')
+RESEND_VERIFICATION_URL = reverse_lazy('core:resend_verification_email')
+SUBMIT_REPORT_URL = reverse_lazy('core:submit_report')
+TEAM_ADMIN_URL = reverse_lazy('core:team_admin')
+FEATURE_REQUEST_CREATE_URL = reverse_lazy('core:feature_request_create')
+PLAYER_STATUS_URL = reverse_lazy('core:player_status')
+PLAYER_METRICS_SELF_URL = reverse_lazy('core:player_metrics_self_ajax')
+
+# django-ratelimit buckets by int(time.time()), so tests freeze the clock and
+# shift it past the window instead of depending on real timing. Blocked
+# requests raise Ratelimited, which is rendered as a 403.
+FROZEN_NOW = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
 
 
 class RateLimitingTests(TestCase):
     """Base class for rate limiting tests."""
     
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.athlete = create_test_athlete()
+        cls.coach = create_test_coach()
+        cls.team = create_test_team(coach=cls.coach)
+    
     def setUp(self):
-        """Set up test data and clear cache."""
-        # Clear cache before each test
-        cache.clear()
-        self.athlete = create_test_athlete()
-        self.coach = create_test_coach()
-        self.team = create_test_team(coach=self.coach)
+        """Isolate the rate limit counters."""
+        isolate_cache_keys(self)
 
 
 class LoginRateLimitingTests(RateLimitingTests):
     """Tests for login rate limiting."""
     
-    def setUp(self):
-        """Set up test data."""
-        super().setUp()
-        self.login_url = reverse('login')
-    
     def test_login_rate_limit_allows_normal_usage(self):
         """Test that normal login attempts are not rate limited."""
         # Try 4 login attempts (under the 5/m limit)
         for i in range(4):
-            response = self.client.post(self.login_url, {
+            response = self.client.post(LOGIN_URL, {
                 'username': 'athlete@example.com',
                 'password': 'wrongpassword'  # Wrong password, but shouldn't be rate limited
             })
-            # Should not be rate limited (will show error but not rate limit error)
-            self.assertNotEqual(response.status_code, 429)  # 429 is rate limit status
-            # Check that we don't have rate limit message
-            if hasattr(response, 'context') and response.context:
-                messages = list(response.context.get('messages', []))
-                rate_limit_messages = [m for m in messages if 'rate limit' in str(m).lower() or 'too many' in str(m).lower()]
-                self.assertEqual(len(rate_limit_messages), 0)
+            # Re-rendered with the form error rather than blocked with a 403
+            self.assertEqual(response.status_code, 200)
     
     def test_login_rate_limit_blocks_excessive_attempts(self):
-        """Test that excessive login attempts are rate limited."""
-        # Make 6 login attempts (exceeds 5/m limit)
-        responses = []
-        for i in range(6):
-            response = self.client.post(self.login_url, {
-                'username': 'athlete@example.com',
-                'password': 'wrongpassword'
-            })
-            responses.append(response)
-        
-        # The 6th attempt should be rate limited
-        # Check if any response shows rate limiting
-        rate_limited = False
-        for response in responses:
-            if hasattr(response, 'context') and response.context:
-                messages = list(response.context.get('messages', []))
-                for message in messages:
-                    if 'too many login attempts' in str(message).lower():
-                        rate_limited = True
-                        break
-        
-        # Should have been rate limited at some point
-        # Note: Rate limiting may not trigger immediately due to cache timing
-        # This test verifies the mechanism is in place
+        """Test that excessive login attempts are rate limited until the window rolls over."""
+        credentials = {'username': 'athlete@example.com', 'password': 'wrongpassword'}
+        with time_machine.travel(FROZEN_NOW, tick=False) as traveller:
+            # The first 5 attempts fit within the 5/m limit
+            for i in range(5):
+                response = self.client.post(LOGIN_URL, credentials)
+                self.assertEqual(response.status_code, 200)
+            
+            # The 6th attempt in the same minute is blocked
+            response = self.client.post(LOGIN_URL, credentials)
+            self.assertEqual(response.status_code, 403)
+            
+            # A new window starts a minute later
+            traveller.shift(61)
+            response = self.client.post(LOGIN_URL, credentials)
+            self.assertEqual(response.status_code, 200)
 
 
+# Signed cookie sessions avoid a django_session write and read on every request
+@override_settings(SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies')
 class SignupRateLimitingTests(RateLimitingTests):
     """Tests for signup rate limiting."""
     
-    def setUp(self):
-        """Set up test data."""
-        super().setUp()
-        self.role_selection_url = reverse('core:role_selection')
-        self.signup_url = reverse('core:signup')
-    
     def test_signup_rate_limit_allows_normal_usage(self):
         """Test that normal signup attempts are not rate limited."""
-        # Set role in session
-        session = self.client.session
-        session['selected_role'] = Profile.Role.ATHLETE
-        session.save()
+        select_signup_role(self.client)
         
         # Try 2 signups (under the 3/h limit)
         for i in range(2):
@@ -99,21 +99,16 @@ class SignupRateLimitingTests(RateLimitingTests):
                 'password2': 'SecurePass123!',
                 'accept_terms': True,
             }
-            response = self.client.post(self.signup_url, signup_data)
+            response = self.client.post(SIGNUP_URL, signup_data)
             # Should not be rate limited
             self.assertNotEqual(response.status_code, 429)
     
     def test_signup_rate_limit_prevents_spam(self):
         """Test that signup rate limiting prevents spam account creation."""
-        # Set role in session
-        session = self.client.session
-        session['selected_role'] = Profile.Role.ATHLETE
-        session.save()
+        select_signup_role(self.client)
         
-        # Make 4 signup attempts (exceeds 3/h limit)
-        responses = []
-        for i in range(4):
-            signup_data = {
+        def signup_data(i):
+            return {
                 'first_name': f'Spam{i}',
                 'last_name': 'User',
                 'email': f'spam{i}@example.com',
@@ -121,26 +116,36 @@ class SignupRateLimitingTests(RateLimitingTests):
                 'password2': 'SecurePass123!',
                 'accept_terms': True,
             }
-            response = self.client.post(self.signup_url, signup_data)
-            responses.append(response)
         
-        # At least one should be rate limited
-        # Check for rate limit indicators in responses
+        with time_machine.travel(FROZEN_NOW, tick=False) as traveller:
+            # The first 3 signups fit within the 3/h limit
+            for i in range(3):
+                response = self.client.post(SIGNUP_URL, signup_data(i))
+                self.assertRedirects(
+                    response, VERIFY_EMAIL_PENDING_URL, fetch_redirect_response=False
+                )
+            
+            # The 4th signup in the same hour is blocked and no account is created
+            response = self.client.post(SIGNUP_URL, signup_data(3))
+            self.assertEqual(response.status_code, 403)
+            self.assertFalse(User.objects.filter(email='spam3@example.com').exists())
+            
+            # A new window starts an hour later
+            traveller.shift(3601)
+            response = self.client.post(SIGNUP_URL, signup_data(3))
+            self.assertRedirects(
+                response, VERIFY_EMAIL_PENDING_URL, fetch_redirect_response=False
+            )
 
 
 class PasswordResetRateLimitingTests(RateLimitingTests):
     """Tests for password reset rate limiting."""
     
-    def setUp(self):
-        """Set up test data."""
-        super().setUp()
-        self.password_reset_url = reverse('password_reset')
-    
     def test_password_reset_rate_limit_allows_normal_usage(self):
         """Test that normal password reset requests are not rate limited."""
         # Try 2 password reset requests (under the 3/h limit)
         for i in range(2):
-            response = self.client.post(self.password_reset_url, {
+            response = self.client.post(PASSWORD_RESET_URL, {
                 'email': 'athlete@example.com'
             })
             # Should not be rate limited
@@ -148,31 +153,30 @@ class PasswordResetRateLimitingTests(RateLimitingTests):
     
     def test_password_reset_rate_limit_blocks_excessive_requests(self):
         """Test that excessive password reset requests are rate limited."""
-        # Make 4 password reset requests (exceeds 3/h limit)
-        responses = []
-        for i in range(4):
-            response = self.client.post(self.password_reset_url, {
-                'email': 'athlete@example.com'
-            })
-            responses.append(response)
-        
-        # Should be rate limited at some point
-        # Check for rate limit messages
+        with time_machine.travel(FROZEN_NOW, tick=False) as traveller:
+            # The first 3 requests fit within the 3/h limit
+            for i in range(3):
+                response = self.client.post(PASSWORD_RESET_URL, {'email': 'athlete@example.com'})
+                self.assertEqual(response.status_code, 302)
+            
+            # The 4th request in the same hour is blocked
+            response = self.client.post(PASSWORD_RESET_URL, {'email': 'athlete@example.com'})
+            self.assertEqual(response.status_code, 403)
+            
+            # A new window starts an hour later
+            traveller.shift(3601)
+            response = self.client.post(PASSWORD_RESET_URL, {'email': 'athlete@example.com'})
+            self.assertEqual(response.status_code, 302)
 
 
 class EmailVerificationResendRateLimitingTests(RateLimitingTests):
     """Tests for email verification resend rate limiting."""
     
-    def setUp(self):
-        """Set up test data."""
-        super().setUp()
-        self.resend_url = reverse('core:resend_verification_email')
-    
     def test_resend_verification_rate_limit_allows_normal_usage(self):
         """Test that normal resend requests are not rate limited."""
         # Try 2 resend requests (under the 3/h limit)
         for i in range(2):
-            response = self.client.post(self.resend_url, {
+            response = self.client.post(RESEND_VERIFICATION_URL, {
                 'email': 'athlete@example.com'
             })
             # Should not be rate limited (may show other errors but not rate limit)
@@ -185,8 +189,7 @@ class ReportSubmissionRateLimitingTests(RateLimitingTests):
     def setUp(self):
         """Set up test data."""
         super().setUp()
-        self.submit_url = reverse('core:submit_report')
-        self.client.login(username='athlete@example.com', password='athletepass123')
+        self.client.force_login(self.athlete)
     
     def test_report_submission_rate_limit_allows_normal_usage(self):
         """Test that normal report submissions are not rate limited."""
@@ -204,7 +207,7 @@ class ReportSubmissionRateLimitingTests(RateLimitingTests):
             'nutrition_quality': 8,
             'hydration': 9,
         }
-        response = self.client.post(self.submit_url, report_data)
+        response = self.client.post(SUBMIT_REPORT_URL, report_data)
         # Should succeed (redirect)
         self.assertEqual(response.status_code, 302)
     
@@ -222,7 +225,7 @@ class ReportSubmissionRateLimitingTests(RateLimitingTests):
             'nutrition_quality': 8,
             'hydration': 9,
         }
-        response = self.client.post(self.submit_url, report_data)
+        response = self.client.post(SUBMIT_REPORT_URL, report_data)
         # Should redirect to login
         self.assertEqual(response.status_code, 302)
 
@@ -233,14 +236,13 @@ class TeamAdminRateLimitingTests(RateLimitingTests):
     def setUp(self):
         """Set up test data."""
         super().setUp()
-        self.team_admin_url = reverse('core:team_admin')
-        self.client.login(username='coach@example.com', password='coachpass123')
+        self.client.force_login(self.coach)
     
     def test_team_admin_rate_limit_allows_normal_usage(self):
         """Test that normal team admin actions are not rate limited."""
         # Team admin is limited to 5/d per user (POST requests only)
         # GET requests should not be rate limited
-        response = self.client.get(self.team_admin_url)
+        response = self.client.get(TEAM_ADMIN_URL)
         self.assertEqual(response.status_code, 200)
     
     def test_team_admin_post_actions_are_rate_limited(self):
@@ -249,7 +251,7 @@ class TeamAdminRateLimitingTests(RateLimitingTests):
         # Note: 5/d limit means we'd need to test over multiple days
         # This test verifies the decorator is in place
         
-        response = self.client.post(self.team_admin_url, {
+        response = self.client.post(TEAM_ADMIN_URL, {
             'action': 'rename',
             'name': 'Renamed Team'
         })
@@ -263,14 +265,13 @@ class FeatureRequestRateLimitingTests(RateLimitingTests):
     def setUp(self):
         """Set up test data."""
         super().setUp()
-        self.feature_request_create_url = reverse('core:feature_request_create')
-        self.client.login(username='athlete@example.com', password='athletepass123')
+        self.client.force_login(self.athlete)
     
     def test_feature_request_creation_rate_limit_allows_normal_usage(self):
         """Test that normal feature request creation is not rate limited."""
         # Feature request creation is limited to 5/d per user
         # Create one feature request
-        response = self.client.post(self.feature_request_create_url, {
+        response = self.client.post(FEATURE_REQUEST_CREATE_URL, {
             'request_type': 'FEATURE',
             'title': 'Test Feature',
             'description': 'This is a test feature request with enough characters to pass validation.'
@@ -283,7 +284,7 @@ class FeatureRequestRateLimitingTests(RateLimitingTests):
         # Logout
         self.client.logout()
         
-        response = self.client.post(self.feature_request_create_url, {
+        response = self.client.post(FEATURE_REQUEST_CREATE_URL, {
             'request_type': 'FEATURE',
             'title': 'Test Feature',
             'description': 'This is a test feature request.'
@@ -298,48 +299,29 @@ class AJAXEndpointRateLimitingTests(RateLimitingTests):
     def setUp(self):
         """Set up test data."""
         super().setUp()
-        self.client.login(username='athlete@example.com', password='athletepass123')
+        self.client.force_login(self.athlete)
     
     def test_player_status_ajax_rate_limit(self):
-        """Test that player status AJAX endpoint is rate limited."""
-        # Player status is limited to 60/m per user
-        url = reverse('core:player_status')
-        
-        # Make multiple requests
-        for i in range(5):
-            response = self.client.get(url)
-            # Should succeed (under limit)
-            self.assertEqual(response.status_code, 200)
+        """Test that player status AJAX endpoint responds to a normal request."""
+        # The endpoint has no ratelimit decorator, so a single request is
+        # enough; looping under an unset limit would not exercise anything
+        response = self.client.get(PLAYER_STATUS_URL)
+        self.assertEqual(response.status_code, 200)
     
     def test_player_metrics_ajax_rate_limit(self):
-        """Test that player metrics AJAX endpoint is rate limited."""
-        # Player metrics is limited to 60/m per user
-        url = reverse('core:player_metrics_self_ajax')
-        
-        # Make multiple requests
-        for i in range(5):
-            response = self.client.get(url)
-            # Should succeed (under limit)
-            # May return 200 or 400/404 if no data, but not 429
-            self.assertNotEqual(response.status_code, 429)
+        """Test that player metrics AJAX endpoint responds to a normal request."""
+        # The endpoint has no ratelimit decorator, so a single request is enough
+        response = self.client.get(PLAYER_METRICS_SELF_URL)
+        self.assertEqual(response.status_code, 200)
 
 
-class RateLimitConfigurationTests(TestCase):
+class RateLimitConfigurationTests(SimpleTestCase):
     """Tests to verify rate limit configuration."""
     
-    def test_rate_limit_cache_backend_configured(self):
-        """Test that rate limit cache backend is configured."""
-        from django.conf import settings
-        self.assertTrue(hasattr(settings, 'RATELIMIT_USE_CACHE'))
-        self.assertEqual(settings.RATELIMIT_USE_CACHE, 'default')
-    
-    def test_django_ratelimit_installed(self):
-        """Test that django-ratelimit is in INSTALLED_APPS."""
-        from django.conf import settings
-        self.assertIn('django_ratelimit', settings.INSTALLED_APPS)
-    
-    def test_rate_limit_decorators_imported(self):
-        """Test that rate limit decorators are imported in views."""
+    def test_rate_limit_configuration_is_valid(self):
+        """Test that django-ratelimit is installed, wired to a configured cache and used by the views."""
         from core.views import ratelimit
+        self.assertIn('django_ratelimit', settings.INSTALLED_APPS)
+        self.assertEqual(settings.RATELIMIT_USE_CACHE, 'default')
+        self.assertIn(settings.RATELIMIT_USE_CACHE, settings.CACHES)
         self.assertIsNotNone(ratelimit)
-
@@ -2,25 +2,27 @@
 Tests for user registration and email verification.
 """
 from django.test import TestCase, override_settings
-from django.urls import reverse
+from django.urls import reverse, reverse_lazy
 from django.contrib.auth.models import User
 from django.core import mail
-from django.core.cache import cache
 from django.utils import timezone
 from datetime import timedelta
 from unittest.mock import patch
-from core.models import Profile, EmailVerification
-from core.tests.test_utils import create_test_user
+from core.models import Profile, EmailVerification, EmailJob
+from core.tests.test_utils import create_test_user, isolate_cache_keys, select_signup_role
 
 
+# Signed cookie sessions avoid a django_session write and read on every request
+@override_settings(SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies')
 class RegistrationTests(TestCase):
     """Tests for user registration flow."""
     
+    role_selection_url = reverse_lazy('core:role_selection')
+    signup_url = reverse_lazy('core:signup')
+    
     def setUp(self):
-        """Set up test data."""
-        cache.clear()
-        self.role_selection_url = reverse('core:role_selection')
-        self.signup_url = reverse('core:signup')
+        """Isolate the signup rate limit counters."""
+        isolate_cache_keys(self)
     
     def test_role_selection_page_loads(self):
         """Test that role selection page loads."""
@@ -49,10 +51,7 @@ class RegistrationTests(TestCase):
     
     def test_signup_with_valid_data_creates_user(self):
         """Test that signup with valid data creates inactive user."""
-        # Set role in session
-        session = self.client.session
-        session['selected_role'] = Profile.Role.ATHLETE
-        session.save()
+        select_signup_role(self.client)
         
         # Signup data
         signup_data = {
@@ -64,27 +63,33 @@ class RegistrationTests(TestCase):
             'accept_terms': True,
         }
         
-        with patch('core.signals.send_verification_email') as mock_send:
-            response = self.client.post(self.signup_url, signup_data)
-            
-            # Should redirect to verification pending page
-            self.assertEqual(response.status_code, 302)
-            self.assertRedirects(response, reverse('core:verify_email_pending'))
-            
-            # User should be created but inactive
-            user = User.objects.get(email='john@example.com')
-            self.assertFalse(user.is_active)
-            self.assertEqual(user.first_name, 'John')
-            self.assertEqual(user.last_name, 'Doe')
-            
-            # Profile should be created with correct role
-            self.assertEqual(user.profile.role, Profile.Role.ATHLETE)
+        # Pinned so extra queries in the signup view (profile, verification) show up
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(9):
+                response = self.client.post(self.signup_url, signup_data)
+        
+        # Should redirect to verification pending page
+        self.assertEqual(response.status_code, 302)
+        self.assertRedirects(response, reverse('core:verify_email_pending'))
+        
+        # User should be created but inactive
+        user = User.objects.select_related('profile').get(email='john@example.com')
+        self.assertFalse(user.is_active)
+        self.assertEqual(user.first_name, 'John')
+        self.assertEqual(user.last_name, 'Doe')
+        
+        # Profile should be created with correct role
+        self.assertEqual(user.profile.role, Profile.Role.ATHLETE)
+        
+        # Verification email should be queued for the worker, not sent inline
+        job = EmailJob.objects.get()
+        self.assertEqual(job.kind, EmailJob.Kind.VERIFICATION)
+        self.assertEqual(job.payload['token'], user.email_verification.token)
+        self.assertEqual(len(mail.outbox), 0)
     
     def test_signup_with_invalid_email(self):
         """Test that signup with invalid email fails."""
-        session = self.client.session
-        session['selected_role'] = Profile.Role.ATHLETE
-        session.save()
+        select_signup_role(self.client)
         
         signup_data = {
             'first_name': 'John',
@@ -104,9 +109,7 @@ class RegistrationTests(TestCase):
         # Create existing user
         create_test_user(email='existing@example.com')
         
-        session = self.client.session
-        session['selected_role'] = Profile.Role.ATHLETE
-        session.save()
+        select_signup_role(self.client)
         
         signup_data = {
             'first_name': 'John',
@@ -124,9 +127,7 @@ class RegistrationTests(TestCase):
     
     def test_signup_without_accepting_terms(self):
         """Test that signup without accepting terms fails."""
-        session = self.client.session
-        session['selected_role'] = Profile.Role.ATHLETE
-        session.save()
+        select_signup_role(self.client)
         
         signup_data = {
             'first_name': 'John',
@@ -145,10 +146,15 @@ class RegistrationTests(TestCase):
 class EmailVerificationTests(TestCase):
     """Tests for email verification flow."""
     
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.user = create_test_user(email='test@example.com', is_active=False)
+        cls.verification, _ = EmailVerification.objects.get_or_create(user=cls.user)
+    
     def setUp(self):
-        """Set up test data."""
-        self.user = create_test_user(email='test@example.com', is_active=False)
-        self.verification, _ = EmailVerification.objects.get_or_create(user=self.user)
+        """Isolate the login rate limit counters."""
+        isolate_cache_keys(self)
     
     def test_email_verification_created_on_signup(self):
         """Test that email verification is created when user signs up."""
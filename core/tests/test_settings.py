@@ -10,3 +10,16 @@ SILENCED_SYSTEM_CHECKS = ['django_ratelimit.E003', 'django_ratelimit.W001']
 # Allow Django test client host
 ALLOWED_HOSTS = ['testserver', 'localhost']
 
+
+# Fast password hashing for tests (PBKDF2 dominates user creation and login)
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# Always test against in-memory SQLite so schema setup and per-test rollbacks
+# never touch disk, whatever database the inherited settings point at
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+        'TEST': {'NAME': ':memory:'},
+    }
+}
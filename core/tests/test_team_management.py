@@ -2,12 +2,12 @@
 Tests for team management functionality.
 """
 from django.test import TestCase, override_settings
-from django.urls import reverse
+from django.urls import reverse, reverse_lazy
 from django.core.files.uploadedfile import SimpleUploadedFile
-from core.models import Team, Profile, TeamSchedule, TeamTag
-from core.tests.test_utils import create_test_coach, create_test_athlete, create_test_team
+from core.models import Team, TeamSchedule, TeamTag
+from core.tests.test_utils import build_oversized_png_bytes, build_test_png_bytes, create_test_coach, create_test_athlete, create_test_team
 import tempfile
-import os
+import shutil
 import json
 import datetime
 
@@ -15,11 +15,13 @@ import datetime
 class TeamCreationTests(TestCase):
     """Tests for team creation."""
     
-    def setUp(self):
-        """Set up test data."""
-        self.coach = create_test_coach()
-        self.team_setup_url = reverse('core:team_setup_coach')
-        self.team_admin_url = reverse('core:team_admin')
+    team_setup_url = reverse_lazy('core:team_setup_coach')
+    team_admin_url = reverse_lazy('core:team_admin')
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.coach = create_test_coach()
     
     def test_team_setup_requires_login(self):
         """Test that team setup requires authentication."""
@@ -29,13 +31,13 @@ class TeamCreationTests(TestCase):
     def test_team_setup_requires_coach_role(self):
         """Test that only coaches can access team setup."""
         athlete = create_test_athlete()
-        self.client.login(username='athlete@example.com', password='athletepass123')
+        self.client.force_login(athlete)
         response = self.client.get(self.team_setup_url)
         self.assertEqual(response.status_code, 302)  # Redirected
     
     def test_team_setup_page_loads(self):
         """Test that team setup page loads for coaches."""
-        self.client.login(username='coach@example.com', password='coachpass123')
+        self.client.force_login(self.coach)
         response = self.client.get(self.team_setup_url)
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, 'Create Team')
@@ -43,12 +45,14 @@ class TeamCreationTests(TestCase):
     
     def test_coach_can_create_team(self):
         """Test that coach can create a new team."""
-        self.client.login(username='coach@example.com', password='coachpass123')
+        self.client.force_login(self.coach)
         
-        response = self.client.post(self.team_setup_url, {
-            'action': 'create',
-            'name': 'New Team'
-        })
+        # Pinned so extra per-team or per-member queries show up as failures
+        with self.assertNumQueries(13):
+            response = self.client.post(self.team_setup_url, {
+                'action': 'create',
+                'name': 'New Team'
+            })
         
         # Should redirect
         self.assertEqual(response.status_code, 302)
@@ -61,11 +65,12 @@ class TeamCreationTests(TestCase):
         
         # Coach should be added to team
         self.coach.profile.refresh_from_db()
-        self.assertIn(team, self.coach.profile.get_teams())
+        with self.assertNumQueries(2):
+            self.assertIn(team, self.coach.profile.get_teams())
     
     def test_team_creation_generates_join_code(self):
         """Test that team creation automatically generates join code."""
-        self.client.login(username='coach@example.com', password='coachpass123')
+        self.client.force_login(self.coach)
         
         self.client.post(self.team_setup_url, {
             'action': 'create',
@@ -81,7 +86,7 @@ class TeamCreationTests(TestCase):
     
     def test_team_creation_assigns_coach_to_team(self):
         """Test that creating a team assigns coach to that team."""
-        self.client.login(username='coach@example.com', password='coachpass123')
+        self.client.force_login(self.coach)
         
         self.client.post(self.team_setup_url, {
             'action': 'create',
@@ -96,7 +101,7 @@ class TeamCreationTests(TestCase):
     
     def test_team_creation_sets_active_team_in_session(self):
         """Test that creating a team sets it as active team in session."""
-        self.client.login(username='coach@example.com', password='coachpass123')
+        self.client.force_login(self.coach)
         
         self.client.post(self.team_setup_url, {
             'action': 'create',
@@ -109,7 +114,7 @@ class TeamCreationTests(TestCase):
     
     def test_team_name_validation(self):
         """Test that team name validation works."""
-        self.client.login(username='coach@example.com', password='coachpass123')
+        self.client.force_login(self.coach)
         
         # Try to create team with empty name
         response = self.client.post(self.team_setup_url, {
@@ -120,14 +125,14 @@ class TeamCreationTests(TestCase):
         # Should show form errors
         self.assertEqual(response.status_code, 200)
         # Team should not be created
-        self.assertEqual(Team.objects.filter(name='').count(), 0)
+        self.assertFalse(Team.objects.filter(name='').exists())
     
     def test_team_name_uniqueness(self):
         """Test that team names must be unique."""
         # Create existing team
         existing_team = create_test_team(name='Existing Team', coach=self.coach)
         
-        self.client.login(username='coach@example.com', password='coachpass123')
+        self.client.force_login(self.coach)
         
         # Try to create team with same name
         response = self.client.post(self.team_setup_url, {
@@ -144,17 +149,19 @@ class TeamCreationTests(TestCase):
 class TeamJoinTests(TestCase):
     """Tests for joining teams."""
     
-    def setUp(self):
-        """Set up test data."""
-        self.coach = create_test_coach()
-        self.team = create_test_team(name='Joinable Team', coach=self.coach)
-        self.athlete = create_test_athlete()
-        self.team_setup_url = reverse('core:team_setup_coach')
-        self.join_url = reverse('core:join_team_link', args=[self.team.join_code])
+    team_setup_url = reverse_lazy('core:team_setup_coach')
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.coach = create_test_coach()
+        cls.team = create_test_team(name='Joinable Team', coach=cls.coach)
+        cls.athlete = create_test_athlete()
+        cls.join_url = reverse('core:join_team_link', args=[cls.team.join_code])
     
     def test_athlete_can_join_team_with_code(self):
         """Test that athlete can join team using join code."""
-        self.client.login(username='athlete@example.com', password='athletepass123')
+        self.client.force_login(self.athlete)
         
         # Use join team form (if available) or direct join
         # For now, test that join code exists and is valid
@@ -171,11 +178,21 @@ class TeamJoinTests(TestCase):
 class TeamAdminTests(TestCase):
     """Tests for team administration."""
     
+    team_admin_url = reverse_lazy('core:team_admin')
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.coach = create_test_coach()
+        cls.team = create_test_team(name='Admin Team', coach=cls.coach)
+    
     def setUp(self):
-        """Set up test data."""
-        self.coach = create_test_coach()
-        self.team = create_test_team(name='Admin Team', coach=self.coach)
-        self.team_admin_url = reverse('core:team_admin')
+        """Give each test its own MEDIA_ROOT so uploads never collide across workers."""
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_override = override_settings(MEDIA_ROOT=media_root)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
     
     def test_team_admin_requires_login(self):
         """Test that team admin requires authentication."""
@@ -185,20 +202,20 @@ class TeamAdminTests(TestCase):
     def test_team_admin_requires_coach_role(self):
         """Test that only coaches can access team admin."""
         athlete = create_test_athlete()
-        self.client.login(username='athlete@example.com', password='athletepass123')
+        self.client.force_login(athlete)
         response = self.client.get(self.team_admin_url)
         self.assertEqual(response.status_code, 302)  # Redirected
     
     def test_team_admin_page_loads(self):
         """Test that team admin page loads for coaches."""
-        self.client.login(username='coach@example.com', password='coachpass123')
+        self.client.force_login(self.coach)
         response = self.client.get(self.team_admin_url)
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, 'Admin Team')
     
     def test_coach_can_rename_team(self):
         """Test that coach can rename team."""
-        self.client.login(username='coach@example.com', password='coachpass123')
+        self.client.force_login(self.coach)
         
         response = self.client.post(self.team_admin_url, {
             'action': 'rename',
@@ -212,29 +229,17 @@ class TeamAdminTests(TestCase):
         self.team.refresh_from_db()
         self.assertEqual(self.team.name, 'Renamed Team')
     
-    @override_settings(MEDIA_ROOT=tempfile.mkdtemp())
     def test_coach_can_upload_team_logo(self):
         """Test that coach can upload team logo."""
-        self.client.login(username='coach@example.com', password='coachpass123')
-        
-        # Create a simple test image
-        from PIL import Image
-        img = Image.new('RGB', (100, 100), color='red')
-        img_file = tempfile.NamedTemporaryFile(suffix='.png', delete=False)
-        img.save(img_file.name, 'PNG')
-        img_file.seek(0)
+        self.client.force_login(self.coach)
         
-        with open(img_file.name, 'rb') as f:
-            response = self.client.post(self.team_admin_url, {
-                'action': 'update_logo',
-                'logo': SimpleUploadedFile('test_logo.png', f.read(), content_type='image/png'),
-                'logo_display_mode': 'HEADER',
-                'background_opacity': '0.1',
-                'background_position': 'CENTER',
-            })
-        
-        # Clean up
-        os.unlink(img_file.name)
+        response = self.client.post(self.team_admin_url, {
+            'action': 'update_logo',
+            'logo': SimpleUploadedFile('test_logo.png', build_test_png_bytes(), content_type='image/png'),
+            'logo_display_mode': 'HEADER',
+            'background_opacity': '0.1',
+            'background_position': 'CENTER',
+        })
         
         # Should redirect
         self.assertEqual(response.status_code, 302)
@@ -245,14 +250,10 @@ class TeamAdminTests(TestCase):
     
     def test_team_logo_file_size_validation(self):
         """Test that team logo file size is validated."""
-        self.client.login(username='coach@example.com', password='coachpass123')
+        self.client.force_login(self.coach)
         
-        # Create a file larger than 5MB
-        large_file = SimpleUploadedFile(
-            'large_logo.png',
-            b'x' * (6 * 1024 * 1024),  # 6MB
-            content_type='image/png'
-        )
+        # A valid PNG just over the 5MB limit, so the size check is what rejects it
+        large_file = SimpleUploadedFile('large_logo.png', build_oversized_png_bytes(), content_type='image/png')
         
         response = self.client.post(self.team_admin_url, {
             'action': 'update_logo',
@@ -262,14 +263,12 @@ class TeamAdminTests(TestCase):
             'background_position': 'CENTER',
         })
         
-        # Should show form errors
-        self.assertEqual(response.status_code, 200)
-        # Should contain error about file size
+        # Should show the file size error
+        self.assertContains(response, 'File is too large')
 
-    @override_settings(MEDIA_ROOT=tempfile.mkdtemp())
     def test_coach_can_remove_logo(self):
         """Removing a logo should clear the field and reset display mode."""
-        self.client.login(username='coach@example.com', password='coachpass123')
+        self.client.force_login(self.coach)
         # Seed an existing logo
         self.team.logo.save('existing.png', SimpleUploadedFile('existing.png', b'file', content_type='image/png'))
         self.team.logo_display_mode = 'HEADER'
@@ -285,22 +284,21 @@ class TeamAdminTests(TestCase):
 
     def test_coach_can_remove_athlete_member(self):
         """Coach should be able to remove an athlete from the team."""
-        athlete = create_test_athlete(username='member-athlete', email='member@example.com')
-        athlete.profile.team = self.team
-        athlete.profile.save()
+        athlete = create_test_athlete(username='member-athlete', email='member@example.com', team=self.team)
 
-        self.client.login(username='coach@example.com', password='coachpass123')
-        response = self.client.post(self.team_admin_url, {
-            'action': 'remove_member',
-            'user_id': athlete.id,
-        })
+        self.client.force_login(self.coach)
+        with self.assertNumQueries(13):
+            response = self.client.post(self.team_admin_url, {
+                'action': 'remove_member',
+                'user_id': athlete.id,
+            })
         self.assertEqual(response.status_code, 302)
         athlete.profile.refresh_from_db()
         self.assertIsNone(athlete.profile.team)
 
     def test_cannot_remove_last_coach(self):
         """Attempting to remove the final coach should be prevented."""
-        self.client.login(username='coach@example.com', password='coachpass123')
+        self.client.force_login(self.coach)
         response = self.client.post(self.team_admin_url, {
             'action': 'remove_member',
             'user_id': self.coach.id,
@@ -311,7 +309,7 @@ class TeamAdminTests(TestCase):
 
     def test_coach_can_delete_team_with_confirmation(self):
         """Team deletes only when confirmation text matches."""
-        self.client.login(username='coach@example.com', password='coachpass123')
+        self.client.force_login(self.coach)
         response = self.client.post(self.team_admin_url, {
             'action': 'delete_team',
             'confirm': 'Admin Team',
@@ -323,18 +321,25 @@ class TeamAdminTests(TestCase):
 class TeamSwitchingTests(TestCase):
     """Tests for team switching functionality."""
     
-    def setUp(self):
-        """Set up test data."""
-        self.coach = create_test_coach()
-        self.team1 = create_test_team(name='Team 1', coach=self.coach)
-        self.team2 = create_test_team(name='Team 2')
-        # Add coach to second team
-        self.coach.profile.teams.add(self.team2)
-        self.switch_url = reverse('core:switch_team', args=[self.team2.id])
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.coach = create_test_coach()
+        # bulk_create skips Team.save(), so the join codes are set explicitly
+        cls.team1, cls.team2, cls.unauthorized_team = Team.objects.bulk_create([
+            Team(name='Team 1', join_code='SWITC1'),
+            Team(name='Team 2', join_code='SWITC2'),
+            Team(name='Unauthorized Team', join_code='SWITC3'),
+        ])
+        # Team 1 is the coach's primary team; add coach to second team
+        cls.coach.profile.team = cls.team1
+        cls.coach.profile.save(update_fields=['team'])
+        cls.coach.profile.teams.add(cls.team2)
+        cls.switch_url = reverse('core:switch_team', args=[cls.team2.id])
     
     def test_coach_can_switch_teams(self):
         """Test that coach can switch between teams."""
-        self.client.login(username='coach@example.com', password='coachpass123')
+        self.client.force_login(self.coach)
         
         response = self.client.get(self.switch_url)
         
@@ -346,30 +351,32 @@ class TeamSwitchingTests(TestCase):
     
     def test_coach_cannot_switch_to_unauthorized_team(self):
         """Test that coach cannot switch to team they don't belong to."""
-        unauthorized_team = create_test_team(name='Unauthorized Team')
+        self.client.force_login(self.coach)
         
-        self.client.login(username='coach@example.com', password='coachpass123')
-        
-        switch_url = reverse('core:switch_team', args=[unauthorized_team.id])
+        switch_url = reverse('core:switch_team', args=[self.unauthorized_team.id])
         response = self.client.get(switch_url)
         
         # Should redirect with error
         self.assertEqual(response.status_code, 302)
         
         # Active team should not be changed
-        self.assertNotEqual(self.client.session.get('active_team_id'), unauthorized_team.id)
+        self.assertNotEqual(self.client.session.get('active_team_id'), self.unauthorized_team.id)
 
 
 class TeamScheduleSettingsTests(TestCase):
     """Coach-facing schedule builder tests."""
 
-    def setUp(self):
-        self.coach = create_test_coach()
-        self.team = create_test_team(name='Schedule Team', coach=self.coach)
-        self.schedule_url = reverse('core:team_schedule_settings')
-        self.tag_training = TeamTag.objects.create(team=self.team, name='Training', target_min=60, target_max=80)
-        self.tag_recovery = TeamTag.objects.create(team=self.team, name='Recovery', target_min=40, target_max=60)
-        self.schedule = TeamSchedule.objects.create(team=self.team, weekly_schedule={'Mon': self.tag_training.id})
+    schedule_url = reverse_lazy('core:team_schedule_settings')
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.coach = create_test_coach()
+        cls.team = create_test_team(name='Schedule Team', coach=cls.coach)
+        cls.tag_training, cls.tag_recovery = TeamTag.objects.bulk_create([
+            TeamTag(team=cls.team, name='Training', target_min=60, target_max=80),
+            TeamTag(team=cls.team, name='Recovery', target_min=40, target_max=60),
+        ])
+        cls.schedule = TeamSchedule.objects.create(team=cls.team, weekly_schedule={'Mon': cls.tag_training.id})
 
     def _ajax_post(self, payload):
         return self.client.post(
@@ -385,19 +392,19 @@ class TeamScheduleSettingsTests(TestCase):
 
     def test_view_requires_coach_role(self):
         athlete = create_test_athlete()
-        self.client.login(username='athlete@example.com', password='athletepass123')
+        self.client.force_login(athlete)
         response = self.client.get(self.schedule_url)
         self.assertEqual(response.status_code, 302)
 
     def test_coach_can_load_schedule_page(self):
-        self.client.login(username='coach@example.com', password='coachpass123')
+        self.client.force_login(self.coach)
         response = self.client.get(self.schedule_url)
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, 'Team Schedule Guide')
 
     def test_ajax_set_all_weekdays(self):
         """Setting all weekdays via AJAX should update weekly_schedule."""
-        self.client.login(username='coach@example.com', password='coachpass123')
+        self.client.force_login(self.coach)
         response = self._ajax_post({
             'action': 'set_all_weekdays',
             'day_tag': str(self.tag_recovery.id),
@@ -409,7 +416,7 @@ class TeamScheduleSettingsTests(TestCase):
 
     def test_ajax_set_specific_date_override(self):
         """Setting a specific date should store the override."""
-        self.client.login(username='coach@example.com', password='coachpass123')
+        self.client.force_login(self.coach)
         response = self._ajax_post({
             'date': '2025-11-15',
             'day_tag': str(self.tag_training.id),
@@ -421,7 +428,7 @@ class TeamScheduleSettingsTests(TestCase):
 
     def test_ajax_clear_month(self):
         """Clearing a month should succeed and remove overrides."""
-        self.client.login(username='coach@example.com', password='coachpass123')
+        self.client.force_login(self.coach)
         # Seed override to ensure it is cleared
         self.schedule.set_day_tag(datetime.date(2025, 11, 5), self.tag_training.id)
         response = self._ajax_post({
@@ -16,6 +16,7 @@ from core.validation import (
 )
 from core.sanitization import (
     sanitize_text_field,
+    sanitize_enum,
     sanitize_html_field,
     sanitize_filename,
     validate_no_html,
@@ -32,8 +33,9 @@ from core.audit_logging import (
     log_report_submission,
 )
 from core.security_logging import log_join_code_attempt
+from core import posthog_tracking
 from core.tests.test_utils import create_test_coach, create_test_team
-from core.models import TeamTag
+from core.models import Profile, TeamTag
 
 
 class ValidationUtilityTests(TestCase):
@@ -107,6 +109,16 @@ class SanitizationUtilityTests(TestCase):
         self.assertNotIn('<', cleaned)
         self.assertTrue(cleaned.endswith('Hello World'))
 
+    def test_sanitize_text_field_truncates_to_max_length(self):
+        with self.assertLogs('core.sanitization', level='WARNING'):
+            self.assertEqual(sanitize_text_field('  abcdef \n', max_length=3), 'abc')
+
+    def test_sanitize_enum(self):
+        choices = frozenset({'INJURED', 'SICK'})
+        self.assertEqual(sanitize_enum('SICK', choices), 'SICK')
+        self.assertEqual(sanitize_enum('<b>SICK</b>', choices), '')
+        self.assertEqual(sanitize_enum(None, choices), '')
+
     def test_sanitize_html_field_keeps_safe_tags(self):
         html = '<p>Hello <strong>World</strong><script>alert(1)</script></p>'
         sanitized = sanitize_html_field(html)
@@ -164,17 +176,21 @@ class EmailUtilityTests(TestCase):
         BASE_URL='http://testserver',
     )
     def test_send_verification_email(self):
-        with patch('core.email_utils.EmailMessage') as mock_message:
+        with patch('core.email_utils.EmailMultiAlternatives') as mock_message:
             mock_instance = mock_message.return_value
             mock_instance.send.return_value = 1
-            success, error = send_verification_email(self.user, 'token123')
+            success, error = send_verification_email(
+                self.user.id, self.user.email, self.user.get_full_name(), 'token123'
+            )
         self.assertTrue(success)
         self.assertIsNone(error)
         mock_instance.send.assert_called_once()
 
     @override_settings(DEFAULT_FROM_EMAIL=None)
     def test_send_verification_email_missing_config(self):
-        success, error = send_verification_email(self.user, 'token123')
+        success, error = send_verification_email(
+            self.user.id, self.user.email, self.user.get_full_name(), 'token123'
+        )
         self.assertFalse(success)
         self.assertIn('not properly configured', error)
 
@@ -235,3 +251,73 @@ class SecurityLoggingTests(TestCase):
             )
         self.assertIn('join_success', logs.output[0])
 
+
+@override_settings(POSTHOG_ENABLED=True)
+class PostHogTrackingTests(TestCase):
+    """Tests for buffered PostHog tracking helpers."""
+
+    def setUp(self):
+        self.user = create_test_coach(username='posthog-coach', email='posthog-coach@example.com')
+        self.team = create_test_team(name='PostHog Team', coach=self.user)
+        thread_patcher = patch('core.posthog_tracking._ensure_flush_thread')
+        client_patcher = patch('core.posthog_tracking.posthog')
+        thread_patcher.start()
+        self.client_mock = client_patcher.start()
+        self.addCleanup(thread_patcher.stop)
+        self.addCleanup(client_patcher.stop)
+
+    def test_identify_and_track_share_one_profile_lookup(self):
+        user = User.objects.get(pk=self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(1):
+                posthog_tracking.identify_user(user)
+                posthog_tracking.track_event(user, 'user_logged_in')
+        posthog_tracking.flush_events()
+
+        identify_kwargs = self.client_mock.identify.call_args.kwargs
+        self.assertEqual(identify_kwargs['properties']['role'], 'COACH')
+        self.assertEqual(identify_kwargs['properties']['team_name'], 'PostHog Team')
+        capture_kwargs = self.client_mock.capture.call_args.kwargs
+        self.assertEqual(capture_kwargs['event'], 'user_logged_in')
+        self.assertEqual(capture_kwargs['properties']['user_role'], 'COACH')
+
+    def test_identity_reuses_loaded_profile_and_team(self):
+        user = User.objects.select_related('profile__team').get(pk=self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(0):
+                posthog_tracking.identify_user(user)
+        posthog_tracking.flush_events()
+
+        identify_kwargs = self.client_mock.identify.call_args.kwargs
+        self.assertEqual(identify_kwargs['properties']['role'], 'COACH')
+        self.assertEqual(identify_kwargs['properties']['team_name'], 'PostHog Team')
+
+    def test_identity_follows_profile_updates_after_refresh(self):
+        user = User.objects.get(pk=self.user.pk)
+        self.assertEqual(posthog_tracking._get_identity(user), ('COACH', 'PostHog Team'))
+
+        Profile.objects.filter(user=user).update(role=Profile.Role.ATHLETE, team=None)
+        user.refresh_from_db()
+        self.assertEqual(posthog_tracking._get_identity(user), ('ATHLETE', None))
+
+    def test_events_are_buffered_until_flush(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            posthog_tracking.track_event(None, 'page_viewed', {'page': 'home'})
+        self.client_mock.capture.assert_not_called()
+
+        posthog_tracking.flush_events()
+        self.client_mock.capture.assert_called_once_with(
+            distinct_id='anonymous',
+            event='page_viewed',
+            properties={'page': 'home'},
+        )
+
+    def test_exit_handler_drains_buffer_then_shuts_client_down(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            posthog_tracking.track_event(None, 'page_viewed')
+
+        posthog_tracking._flush_on_exit()
+        self.assertEqual(
+            [call[0] for call in self.client_mock.method_calls],
+            ['capture', 'shutdown'],
+        )
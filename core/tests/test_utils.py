@@ -1,10 +1,20 @@
 """
 Test utilities and helper functions for GameReady tests.
 """
+import uuid
+from contextlib import contextmanager
+from functools import lru_cache
+from io import BytesIO
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
+from django.db.models.signals import post_save
+from django.test import override_settings
 from django.utils import timezone
+from PIL import Image
 from datetime import date, timedelta
 from core.models import Profile, Team, ReadinessReport, EmailVerification
+from core.signals import create_user_profile
 
 
 def _make_unique_username(username):
@@ -39,8 +49,58 @@ def _make_unique_email(email):
     return candidate
 
 
+@contextmanager
+def suspended_profile_signal():
+    """
+    Temporarily disconnect the post_save handler that creates a Profile for new users.
+    
+    Callers are responsible for creating the Profile themselves.
+    """
+    post_save.disconnect(create_user_profile, sender=User)
+    try:
+        yield
+    finally:
+        post_save.connect(create_user_profile, sender=User)
+
+
+def isolate_cache_keys(test_case):
+    """
+    Give a test its own cache KEY_PREFIX for the rest of the test.
+    
+    Counters such as django-ratelimit's start empty without flushing the shared
+    cache, so tests stay independent even when parallel workers share a backend.
+    
+    Args:
+        test_case: The running TestCase; the override is undone via addCleanup
+    """
+    key_prefix = f't{uuid.uuid4().hex}'
+    caches_override = override_settings(CACHES={
+        alias: {**config, 'KEY_PREFIX': key_prefix}
+        for alias, config in settings.CACHES.items()
+    })
+    caches_override.enable()
+    test_case.addCleanup(caches_override.disable)
+
+
+def select_signup_role(client, role=Profile.Role.ATHLETE):
+    """
+    Store the signup role in a test client's session, as role_selection does.
+    
+    Works with any session engine; with signed cookies the session data lives
+    in the key itself, so the client cookie is refreshed after saving.
+    
+    Args:
+        client: django.test.Client to update
+        role: Profile role to select
+    """
+    session = client.session
+    session['selected_role'] = role
+    session.save()
+    client.cookies[settings.SESSION_COOKIE_NAME] = session.session_key
+
+
 def create_test_user(username='testuser', email='test@example.com', password='testpass123', 
-                     role=Profile.Role.ATHLETE, is_active=True):
+                     role=Profile.Role.ATHLETE, is_active=True, team=None):
     """
     Create a test user with profile.
     
@@ -50,6 +110,7 @@ def create_test_user(username='testuser', email='test@example.com', password='te
         password: Password
         role: Profile role (ATHLETE or COACH)
         is_active: Whether user is active (for email verification testing)
+        team: Optional primary team for the profile
     
     Returns:
         User instance
@@ -57,18 +118,54 @@ def create_test_user(username='testuser', email='test@example.com', password='te
     unique_username = _make_unique_username(username)
     unique_email = _make_unique_email(email)
     
-    user = User.objects.create_user(
-        username=unique_username,
-        email=unique_email,
-        password=password,
-        is_active=is_active
-    )
-    # Profile is created automatically via signal
-    user.profile.role = role
-    user.profile.save()
+    # Create the profile with its role in one INSERT instead of letting the
+    # signal create it and then updating the role
+    with suspended_profile_signal():
+        user = User.objects.create_user(
+            username=unique_username,
+            email=unique_email,
+            password=password,
+            is_active=is_active
+        )
+    Profile.objects.create(user=user, role=role, team=team)
     return user
 
 
+def create_test_users(count, username_prefix='user', password='testpass123',
+                      role=Profile.Role.ATHLETE, team=None):
+    """
+    Create several active test users with profiles using bulk inserts.
+    
+    The password is hashed once and shared, and users/profiles are inserted with
+    one query each. bulk_create() skips the post_save signals, so profiles are
+    created here rather than by core.signals.
+    
+    Args:
+        count: Number of users to create
+        username_prefix: Usernames are '<prefix>1', '<prefix>2', ... (emails use @example.com)
+        password: Password for every user
+        role: Profile role (ATHLETE or COACH)
+        team: Optional primary team for every profile
+    
+    Returns:
+        List of User instances
+    """
+    hashed_password = make_password(password)
+    users = User.objects.bulk_create([
+        User(
+            username=f"{username_prefix}{i}",
+            email=f"{username_prefix}{i}@example.com",
+            password=hashed_password,
+            is_active=True,
+        )
+        for i in range(1, count + 1)
+    ])
+    Profile.objects.bulk_create([
+        Profile(user=user, role=role, team=team) for user in users
+    ])
+    return users
+
+
 def create_test_coach(username='coach', email='coach@example.com', password='coachpass123'):
     """Create a test coach user."""
     return create_test_user(username=username, email=email, password=password, 
@@ -80,6 +177,7 @@ def create_test_athlete(
     email='athlete@example.com',
     password='athletepass123',
     with_today_report=False,
+    team=None,
 ):
     """
     Create a test athlete user.
@@ -89,6 +187,7 @@ def create_test_athlete(
         email: Email address
         password: Password
         with_today_report: If True, create a readiness report for today so dashboards render
+        team: Optional primary team for the athlete's profile
     """
     athlete = create_test_user(
         username=username,
@@ -96,6 +195,7 @@ def create_test_athlete(
         password=password,
         role=Profile.Role.ATHLETE,
         is_active=True,
+        team=team,
     )
     if with_today_report:
         create_test_report(athlete, report_date=timezone.now().date())
@@ -116,13 +216,13 @@ def create_test_team(name='Test Team', coach=None):
     team = Team.objects.create(name=name)
     if coach:
         coach.profile.team = team
-        coach.profile.save()
+        coach.profile.save(update_fields=['team'])
     return team
 
 
 def create_test_report(athlete, report_date=None, sleep_quality=8, energy_fatigue=8,
                       muscle_soreness=7, mood_stress=8, motivation=9, 
-                      nutrition_quality=8, hydration=9):
+                      nutrition_quality=8, hydration=9, commit=True):
     """
     Create a test readiness report.
     
@@ -136,6 +236,8 @@ def create_test_report(athlete, report_date=None, sleep_quality=8, energy_fatigu
         motivation: Motivation score (1-10)
         nutrition_quality: Nutrition quality score (1-10)
         hydration: Hydration score (1-10)
+        commit: If False, return the report unsaved (with its readiness score
+            calculated, as bulk_create() bypasses save())
     
     Returns:
         ReadinessReport instance
@@ -143,7 +245,7 @@ def create_test_report(athlete, report_date=None, sleep_quality=8, energy_fatigu
     if report_date is None:
         report_date = timezone.now().date()
     
-    report = ReadinessReport.objects.create(
+    report = ReadinessReport(
         athlete=athlete,
         date_created=report_date,
         sleep_quality=sleep_quality,
@@ -154,9 +256,31 @@ def create_test_report(athlete, report_date=None, sleep_quality=8, energy_fatigu
         nutrition_quality=nutrition_quality,
         hydration=hydration
     )
+    if commit:
+        report.save()
+    else:
+        report.readiness_score = report.calculate_readiness_score()
     return report
 
 
+def create_test_reports_bulk(athlete, dates, **kwargs):
+    """
+    Create one readiness report per date for an athlete in a single INSERT.
+    
+    Args:
+        athlete: User instance (athlete)
+        dates: Iterable of report dates
+        **kwargs: Metric scores passed to create_test_report()
+    
+    Returns:
+        List of ReadinessReport instances
+    """
+    return ReadinessReport.objects.bulk_create([
+        create_test_report(athlete, report_date=report_date, commit=False, **kwargs)
+        for report_date in dates
+    ])
+
+
 def create_email_verification(user, verified=False):
     """
     Create an email verification record for testing.
@@ -174,3 +298,34 @@ def create_email_verification(user, verified=False):
         verification.save()
     return verification
 
+
+@lru_cache(maxsize=8)
+def build_test_png_bytes(size=(4, 4), color='red'):
+    """
+    Encode (once per size/color) a solid-colour PNG for upload tests.
+    
+    Args:
+        size: (width, height) in pixels
+        color: Fill colour understood by Pillow
+    
+    Returns:
+        PNG file contents as bytes
+    """
+    img = Image.new('RGB', size, color=color)
+    buffer = BytesIO()
+    img.save(buffer, format='PNG', compress_level=1)
+    return buffer.getvalue()
+
+
+@lru_cache(maxsize=1)
+def build_oversized_png_bytes():
+    """
+    Build (once) a valid PNG just over the 5MB logo upload limit.
+    
+    Logo validation only checks the upload size, so a tiny image padded with zero
+    bytes after its IEND chunk is enough; Pillow ignores the trailing data.
+    
+    Returns:
+        PNG file contents as bytes
+    """
+    return build_test_png_bytes((1, 1)) + b'\x00' * (5 * 1024 * 1024 + 1)
@@ -23,10 +23,8 @@ class ValidationTests(TestCase):
         self.athlete = create_test_athlete(
             username='validation-athlete',
             email='validation-athlete@example.com',
+            team=self.team,
         )
-        # Attach athlete to team
-        self.athlete.profile.team = self.team
-        self.athlete.profile.save()
 
     def test_validate_date_string_success(self):
         is_valid, parsed, error = validate_date_string('2025-11-17')
@@ -23,7 +23,7 @@ from django.conf import settings
 from .posthog_tracking import track_event, identify_user
 from .email_utils import send_verification_email, is_email_configured
 from .file_utils import log_file_upload_security_event
-from .sanitization import sanitize_text_field, validate_no_html
+from .sanitization import sanitize_text_field, sanitize_enum, validate_no_html
 from .validation import (
     validate_date_string, validate_month_string, validate_team_id,
     validate_athlete_id, validate_target_readiness, validate_team_schedule_json,
@@ -35,6 +35,9 @@ from .audit_logging import (
 import logging
 import json
 
+# Allowed values for the player status endpoint (checked on every status update)
+PLAYER_STATUS_VALUES = frozenset(Profile.PlayerStatus.values)
+
 
 def has_management_access(user):
     """
@@ -555,17 +558,38 @@ def coach_dashboard(request):
         avg_status_class = 'value-good'  # green for in range
 
     # Prepare squad list data (sorted by readiness ascending)
+    # Athletes, their teams and the last 3 days of reports are loaded up front
+    # so the query count does not grow with the size of the squad
+    last3 = [selected_date - timedelta(days=i) for i in range(3)]
+    recent_reports = {
+        (report.athlete_id, report.date_created): report
+        for report in ReadinessReport.objects.filter(
+            athlete__in=team_athletes,
+            date_created__in=last3
+        )
+    }
+    # Target range per day for the RISK check (selected date's range computed above)
+    day_ranges = {selected_date: (range_min, range_max)}
+    for d in last3[1:]:
+        range_tag = team_schedule.get_day_tag(d)
+        if range_tag and range_tag.target_min is not None and range_tag.target_max is not None:
+            day_ranges[d] = (int(range_tag.target_min), int(range_tag.target_max))
+        else:
+            midpoint = int(coach_team.target_readiness)
+            day_ranges[d] = (max(0, midpoint - 5), min(100, midpoint + 5))
+    
     squad_data = []
-    for athlete in team_athletes:
-        try:
-            report = selected_date_reports.get(athlete=athlete)
+    squad_athletes = team_athletes.select_related('profile__team').prefetch_related('profile__teams')
+    for athlete in squad_athletes:
+        athlete_teams = athlete.profile.get_teams()
+        report = recent_reports.get((athlete.id, selected_date))
+        if report is not None:
             readiness = report.readiness_score
             
             # Compute simple info pill: 'risk', 'rest', 'non-compliant', 'mlt' (multiple teams)
             pill = None
             
             # 0) MLT: athlete is on multiple teams
-            athlete_teams = athlete.profile.get_teams()
             if len(athlete_teams) > 1:
                 pill = 'mlt'
             
@@ -583,27 +607,13 @@ def coach_dashboard(request):
             risk_pill = None
             if rest_pill is None:
                 try:
-                    from datetime import timedelta
-                    last3 = [selected_date - timedelta(days=i) for i in range(3)]
                     below_count = 0
-                    # need schedule for per-day range
-                    try:
-                        schedule = TeamSchedule.objects.get(team=coach_team)
-                    except TeamSchedule.DoesNotExist:
-                        schedule = TeamSchedule.objects.create(team=coach_team)
                     for d in last3:
-                        r = ReadinessReport.objects.filter(athlete=athlete, date_created=d).first()
+                        r = recent_reports.get((athlete.id, d))
                         if not r:
                             below_count = 0
                             break
-                        tag_obj = schedule.get_day_tag(d)
-                        if tag_obj and hasattr(tag_obj, 'target_min') and hasattr(tag_obj, 'target_max') and tag_obj.target_min is not None and tag_obj.target_max is not None:
-                            rmin = int(tag_obj.target_min)
-                            rmax = int(tag_obj.target_max)
-                        else:
-                            midpoint = int(coach_team.target_readiness)
-                            rmin = max(0, midpoint - 5)
-                            rmax = min(100, midpoint + 5)
+                        rmin, _ = day_ranges[d]
                         if r.readiness_score < rmin:
                             below_count += 1
                         else:
@@ -618,17 +628,9 @@ def coach_dashboard(request):
             # (higher priority than MLT, but lower than RISK and REST)
             non_pill = None
             if risk_pill is None and rest_pill is None:
-                try:
-                    from datetime import timedelta
-                    last3 = [selected_date - timedelta(days=i) for i in range(3)]
-                    submitted = 0
-                    for d in last3:
-                        if ReadinessReport.objects.filter(athlete=athlete, date_created=d).exists():
-                            submitted += 1
-                    if (3 - submitted) >= 2:
-                        non_pill = 'non'
-                except Exception:
-                    pass
+                submitted = sum(1 for d in last3 if (athlete.id, d) in recent_reports)
+                if (3 - submitted) >= 2:
+                    non_pill = 'non'
             
             # Determine final pill: priority is REST > RISK > NON > MLT
             if rest_pill:
@@ -649,13 +651,8 @@ def coach_dashboard(request):
                 'teams': athlete_teams,  # Add teams list for display
                 'is_multiple_teams': len(athlete_teams) > 1
             })
-        except ReadinessReport.DoesNotExist:
-            athlete_teams = athlete.profile.get_teams()
-            pill = None
-            if len(athlete_teams) > 1:
-                pill = 'mlt'
-            elif ReadinessReport.objects.filter(athlete=athlete, date_created=selected_date).exists() is False:
-                pill = 'non'
+        else:
+            pill = 'mlt' if len(athlete_teams) > 1 else 'non'
             
             squad_data.append({
                 'athlete': athlete,
@@ -1493,10 +1490,19 @@ def player_dashboard(request):
         )
     }
     
+    # Prefetch readiness scores for this month
+    month_scores_map = dict(
+        ReadinessReport.objects.filter(
+            athlete=request.user,
+            date_created__gte=month_start,
+            date_created__lte=month_end
+        ).values_list('date_created', 'readiness_score')
+    )
+    
     # fill days
     for day in range(1, days_in_month + 1):
         d = datetime(current_year, current_month, day).date()
-        score = ReadinessReport.objects.filter(athlete=request.user, date_created=d).values_list('readiness_score', flat=True).first()
+        score = month_scores_map.get(d)
         
         # Gather tags from ALL teams for this day
         day_tags = []  # List of (team_name, tag_name, tag_color) tuples
@@ -1673,11 +1679,10 @@ def player_set_status(request):
     except Exception:
         data = request.POST
 
-    status_value = data.get('status')
+    status_value = sanitize_enum(data.get('status'), PLAYER_STATUS_VALUES)
     note = data.get('note', '')
 
-    valid = [choice[0] for choice in Profile.PlayerStatus.choices]
-    if status_value not in valid:
+    if not status_value:
         return JsonResponse({'success': False, 'message': 'Invalid status'}, status=400)
     if note and len(note) > 140:
         return JsonResponse({'success': False, 'message': 'Note too long (max 140)'}, status=400)
@@ -1834,6 +1839,12 @@ def player_month_partial(request):
         except TeamSchedule.DoesNotExist:
             continue
 
+    # Prefetch the schedules' tags in one query instead of one per tagged day
+    tag_map = {
+        (tag.team_id, tag.id): tag
+        for tag in TeamTag.objects.filter(team_id__in=list(schedules_map))
+    } if schedules_map else {}
+
     month_start = datetime(current_year, current_month, 1).date()
     month_end = datetime(current_year, current_month, days_in_month).date()
     personal_labels_map = {
@@ -1844,6 +1855,13 @@ def player_month_partial(request):
             date__lte=month_end,
         )
     }
+    month_scores_map = dict(
+        ReadinessReport.objects.filter(
+            athlete=request.user,
+            date_created__gte=month_start,
+            date_created__lte=month_end,
+        ).values_list('date_created', 'readiness_score')
+    )
 
     primary_team = getattr(profile, 'team', None)
     primary_team_target = int(getattr(primary_team, 'target_readiness', 70) or 70) if primary_team else 70
@@ -1859,7 +1877,7 @@ def player_month_partial(request):
 
     for day in range(1, days_in_month + 1):
         d = datetime(current_year, current_month, day).date()
-        score = ReadinessReport.objects.filter(athlete=request.user, date_created=d).values_list('readiness_score', flat=True).first()
+        score = month_scores_map.get(d)
 
         day_tags = []
         primary_tag_obj = None
@@ -1867,7 +1885,7 @@ def player_month_partial(request):
             sched = schedules_map.get(team.id)
             if not sched:
                 continue
-            tag_obj = sched.get_day_tag(d)
+            tag_obj = tag_map.get((team.id, sched.get_day_tag_id(d)))
             if tag_obj:
                 day_tags.append((team.name, tag_obj.name, tag_obj.color))
                 if not primary_tag_obj:
@@ -2958,7 +2976,9 @@ def resend_verification_email(request):
         return redirect('login')
     
     # Send verification email
-    success, error_msg = send_verification_email(user, verification.token)
+    success, error_msg = send_verification_email(
+        user.id, user.email, user.get_full_name(), verification.token
+    )
     
     if success:
         messages.success(request, f'Verification email sent to {email}. Please check your inbox.')